@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.urls import reverse
 from .models import User
 
 @admin.register(User)
@@ -6,3 +7,10 @@ class UserAdmin(admin.ModelAdmin):
     list_display = ('username', 'email', 'role', 'is_active')
     list_filter = ('role', 'is_active')
     search_fields = ('username', 'email')
+
+    def get_search_results(self, request, queryset, search_term):
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        # provider pickers in the bookings admin only offer providers
+        if request.GET.get('field_name') == 'provider' and request.path == reverse('admin:autocomplete'):
+            queryset = queryset.filter(role='provider')
+        return queryset, may_have_duplicates
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-19 11:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_specialty'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='timezone',
+            field=models.CharField(default='UTC', help_text="IANA zone used for this user's calendar days", max_length=64),
+        ),
+    ]
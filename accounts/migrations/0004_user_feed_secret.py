@@ -0,0 +1,27 @@
+# Generated by Django 5.0.7 on 2026-10-19 11:46
+
+import accounts.models
+from django.db import migrations, models
+
+
+def give_each_user_a_secret(apps, schema_editor):
+    # AddField evaluated the default once, so existing users share a value
+    User = apps.get_model('accounts', 'User')
+    for user in User.objects.only('pk').iterator():
+        User.objects.filter(pk=user.pk).update(feed_secret=accounts.models.new_feed_secret())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_timezone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='feed_secret',
+            field=models.CharField(default=accounts.models.new_feed_secret, editable=False, help_text='Signs the calendar feed URLs; reset it to revoke them', max_length=32),
+        ),
+        migrations.RunPython(give_each_user_a_secret, migrations.RunPython.noop),
+    ]
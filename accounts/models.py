@@ -1,6 +1,14 @@
+import secrets
+
 from django.contrib.auth.models import AbstractUser
+from django.conf import settings
 from django.db import models
 
+
+def new_feed_secret():
+    return secrets.token_hex(16)
+
+
 class User(AbstractUser):
     ROLE_CHOICES = (
         ('customer', 'Customer'),
@@ -8,6 +16,8 @@ class User(AbstractUser):
     )
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='customer')
     specialty = models.CharField(max_length=100, blank=True)
+    timezone = models.CharField(max_length=64, default=settings.TIME_ZONE, help_text="IANA zone used for this user's calendar days")
+    feed_secret = models.CharField(max_length=32, default=new_feed_secret, editable=False, help_text="Signs the calendar feed URLs; reset it to revoke them")
 
     def is_provider(self):
         return self.role == 'provider'
@@ -4,8 +4,10 @@ from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
 from bookings.models import Appointment
+from bookings.feeds import feed_token
 from .forms import UserRegisterForm
 from .models import User
+from config.replicas import replica_reads
 
 
 def register(request):
@@ -21,21 +23,22 @@ def register(request):
 
 @login_required
 def dashboard(request):
-    context = {}
+    context = {'feed_token': feed_token(request.user)}
     now = timezone.now()
     if request.user.is_provider():
-        provider_appts = Appointment.objects.filter(slot__provider=request.user)
+        provider_appts = Appointment.objects.filter(slot__provider=request.user).select_related('slot__provider', 'customer')
         context['pending_requests'] = provider_appts.filter(status='pending')[:10]
         context['upcoming_approved'] = provider_appts.filter(status='approved', slot__start_time__gte=now)[:10]
         template = 'accounts/dashboard_provider.html'
     else:
-        my_appts = Appointment.objects.filter(customer=request.user)
+        my_appts = Appointment.objects.filter(customer=request.user).select_related('slot__provider', 'customer')
         context['upcoming'] = my_appts.filter(status__in=['pending','approved'], slot__start_time__gte=now)[:10]
         context['past'] = my_appts.filter(slot__start_time__lt=now).exclude(status='cancelled')[:10]
         template = 'accounts/dashboard_customer.html'
     return render(request, template, context)
 
 @login_required
+@replica_reads
 def providers_list(request):
     providers = User.objects.filter(role='provider')
     q = request.GET.get('q')
@@ -0,0 +1,13 @@
+from django.contrib import admin
+from .models import HourlyRollup, DailyRollup
+
+@admin.register(DailyRollup)
+class DailyRollupAdmin(admin.ModelAdmin):
+    list_display = ('day', 'provider', 'appointment_type', 'booked', 'approved', 'completed', 'no_show')
+    list_select_related = ('provider',)
+    date_hierarchy = 'day'
+
+@admin.register(HourlyRollup)
+class HourlyRollupAdmin(admin.ModelAdmin):
+    list_display = ('hour', 'provider', 'appointment_type', 'booked', 'approved', 'completed', 'no_show')
+    list_select_related = ('provider',)
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics.rollups import rebuild
+from bookings.timeutils import parse_day
+
+
+class Command(BaseCommand):
+    help = 'Rebuild hourly/daily appointment rollups from the appointment table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='start', help='first day to rebuild (YYYY-MM-DD), default: all')
+        parser.add_argument('--to', dest='end', help='day after the last one to rebuild (YYYY-MM-DD), default: all')
+
+    def handle(self, *args, **options):
+        start = parse_day(options['start'])
+        end = parse_day(options['end'])
+        if options['start'] and not start or options['end'] and not end:
+            raise CommandError('Dates must be YYYY-MM-DD.')
+        written = rebuild(start, end)
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} rollup rows.'))
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.7 on 2026-10-19 11:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hourlyrollup',
+            index=models.Index(fields=['hour'], name='analytics_h_hour_b213b6_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+from django.db import models
+from django.conf import settings
+
+User = settings.AUTH_USER_MODEL
+
+
+class RollupCounters(models.Model):
+    """Event counters shared by the hourly and daily rollups.
+
+    Each counter counts transitions *into* a state for appointments whose
+    slot starts in the row's bucket, so they only ever grow.
+    """
+    provider = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    appointment_type = models.CharField(max_length=20)
+    booked = models.PositiveIntegerField(default=0)
+    approved = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+    cancelled = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    no_show = models.PositiveIntegerField(default=0)
+    booked_minutes = models.PositiveIntegerField(default=0)
+    # sum/count of seconds from request to approval
+    approval_latency_seconds = models.BigIntegerField(default=0)
+    approval_latency_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class HourlyRollup(RollupCounters):
+    hour = models.DateTimeField(help_text="UTC hour the slots start in")
+
+    class Meta:
+        ordering = ['hour']
+        unique_together = ('provider', 'hour', 'appointment_type')
+        indexes = [models.Index(fields=['hour'])]
+
+    def __str__(self):
+        return f"{self.provider_id} {self.hour:%Y-%m-%d %H}:00 {self.appointment_type}"
+
+
+class DailyRollup(RollupCounters):
+    day = models.DateField(help_text="Provider-local day the slots start on")
+
+    class Meta:
+        ordering = ['day']
+        unique_together = ('provider', 'day', 'appointment_type')
+        indexes = [models.Index(fields=['day'])]
+
+    def __str__(self):
+        return f"{self.provider_id} {self.day} {self.appointment_type}"
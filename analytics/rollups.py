@@ -0,0 +1,135 @@
+"""Keeping the hourly/daily rollups current.
+
+The booking views call ``record_transition`` whenever an appointment is
+created or changes status. It adds one to the matching counters of the
+hourly and daily rows for the appointment's slot with a single
+``UPDATE ... SET n = n + 1`` each, creating the row on first use. Reports
+then read a few rollup rows instead of aggregating ``Appointment`` joined to
+``Slot``.
+
+``rebuild`` recomputes rows from the current appointment table for the
+``backfill_rollups`` command. History is not stored, so a rebuild counts
+each appointment under its current status only, and approval latency is
+taken from ``updated_at`` for appointments that are still ``approved``.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from bookings.models import Appointment
+from bookings.timeutils import user_timezone, zone_named
+from .models import HourlyRollup, DailyRollup
+
+STATUS_COUNTERS = {
+    'approved': 'approved',
+    'rejected': 'rejected',
+    'cancelled': 'cancelled',
+    'completed': 'completed',
+    'no_show': 'no_show',
+}
+
+
+def hour_bucket(moment):
+    return moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _bump(model, keys, deltas):
+    updates = {name: F(name) + value for name, value in deltas.items()}
+    if model.objects.filter(**keys).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**keys, **deltas)
+    except IntegrityError:
+        # another request created the row first
+        model.objects.filter(**keys).update(**updates)
+
+
+def _deltas(appointment, slot, new_status, now):
+    if new_status == 'pending':
+        minutes = int((slot.end_time - slot.start_time).total_seconds() // 60)
+        return {'booked': 1, 'booked_minutes': minutes}
+    counter = STATUS_COUNTERS.get(new_status)
+    if counter is None:
+        return {}
+    deltas = {counter: 1}
+    if new_status == 'approved':
+        deltas['approval_latency_seconds'] = int((now - appointment.created_at).total_seconds())
+        deltas['approval_latency_count'] = 1
+    return deltas
+
+
+def record_transition(appointment, new_status, now=None):
+    """Count ``appointment`` entering ``new_status`` ('pending' means newly booked)."""
+    slot = appointment.slot
+    deltas = _deltas(appointment, slot, new_status, now or timezone.now())
+    if not deltas:
+        return
+    provider = slot.provider
+    base = {'provider_id': provider.pk, 'appointment_type': appointment.appointment_type}
+    local_day = slot.start_time.astimezone(user_timezone(provider)).date()
+    _bump(HourlyRollup, {**base, 'hour': hour_bucket(slot.start_time)}, deltas)
+    _bump(DailyRollup, {**base, 'day': local_day}, deltas)
+
+
+def rebuild(start_day=None, end_day=None):
+    """Recompute rollups for ``[start_day, end_day)``; returns rows written.
+
+    Hourly rows are selected by UTC hour, daily rows by the provider's local
+    day, so the appointment query is widened by a day on each side and rows
+    are sorted into buckets individually.
+    """
+    appointments = Appointment.objects.all()
+    hourly_scope = HourlyRollup.objects.all()
+    daily_scope = DailyRollup.objects.all()
+    since = until = None
+    if start_day:
+        since = datetime.combine(start_day, time.min, tzinfo=dt_timezone.utc)
+        appointments = appointments.filter(slot__start_time__gte=since - timedelta(days=1))
+        hourly_scope = hourly_scope.filter(hour__gte=since)
+        daily_scope = daily_scope.filter(day__gte=start_day)
+    if end_day:
+        until = datetime.combine(end_day, time.min, tzinfo=dt_timezone.utc)
+        appointments = appointments.filter(slot__start_time__lt=until + timedelta(days=1))
+        hourly_scope = hourly_scope.filter(hour__lt=until)
+        daily_scope = daily_scope.filter(day__lt=end_day)
+
+    hourly = defaultdict(lambda: defaultdict(int))
+    daily = defaultdict(lambda: defaultdict(int))
+    rows = appointments.values_list(
+        'status', 'appointment_type', 'created_at', 'updated_at',
+        'slot__provider_id', 'slot__provider__timezone', 'slot__start_time', 'slot__end_time',
+    ).iterator(chunk_size=2000)
+    for status, kind, created, updated, provider_id, tz_name, start, end in rows:
+        counters = {'booked': 1, 'booked_minutes': int((end - start).total_seconds() // 60)}
+        if status in STATUS_COUNTERS:
+            counters[STATUS_COUNTERS[status]] = 1
+        if status == 'approved':
+            counters['approval_latency_seconds'] = int((updated - created).total_seconds())
+            counters['approval_latency_count'] = 1
+        hour = hour_bucket(start)
+        day = start.astimezone(zone_named(tz_name)).date()
+        targets = []
+        if (since is None or hour >= since) and (until is None or hour < until):
+            targets.append(hourly[(provider_id, hour, kind)])
+        if (start_day is None or day >= start_day) and (end_day is None or day < end_day):
+            targets.append(daily[(provider_id, day, kind)])
+        for bucket in targets:
+            for name, value in counters.items():
+                bucket[name] += value
+
+    with transaction.atomic():
+        hourly_scope.delete()
+        daily_scope.delete()
+        HourlyRollup.objects.bulk_create(
+            [HourlyRollup(provider_id=p, hour=h, appointment_type=k, **c) for (p, h, k), c in hourly.items()],
+            batch_size=1000,
+        )
+        DailyRollup.objects.bulk_create(
+            [DailyRollup(provider_id=p, day=d, appointment_type=k, **c) for (p, d, k), c in daily.items()],
+            batch_size=1000,
+        )
+    return len(hourly) + len(daily)
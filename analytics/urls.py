@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('daily/', views.daily_stats, name='analytics_daily'),
+    path('summary/', views.summary_stats, name='analytics_summary'),
+]
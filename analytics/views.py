@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db.models import Sum
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+
+from accounts.models import User
+from bookings.timeutils import any_zone_day_range, parse_day, zone_named
+from config.ids import parse_db_int
+from .models import HourlyRollup, DailyRollup
+
+COUNTERS = (
+    'booked', 'approved', 'rejected', 'cancelled', 'completed', 'no_show',
+    'booked_minutes', 'approval_latency_seconds', 'approval_latency_count',
+)
+DEFAULT_RANGE_DAYS = 30
+
+
+def _range(request):
+    """``?from=``/``?to=`` local days (``to`` inclusive), defaulting to the last 30 days."""
+    end = parse_day(request.GET.get('to')) or timezone.localdate()
+    start = parse_day(request.GET.get('from')) or end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    return start, end + timedelta(days=1)
+
+
+def _provider_id(request):
+    """``?provider=`` as an int (``None`` when absent); ``ValueError`` when malformed."""
+    raw = request.GET.get('provider')
+    return parse_db_int(raw) if raw else None
+
+
+def _bad_provider():
+    return JsonResponse({'error': 'provider must be an integer id'}, status=400)
+
+
+def _scoped(qs, provider_id):
+    if provider_id is not None:
+        qs = qs.filter(provider_id=provider_id)
+    return qs
+
+
+def _summary(totals):
+    booked = totals['booked'] or 0
+    finished = (totals['completed'] or 0) + (totals['no_show'] or 0)
+    latency_count = totals['approval_latency_count'] or 0
+    return {
+        **{name: totals[name] or 0 for name in COUNTERS if not name.startswith('approval_latency')},
+        'no_show_rate': round(totals['no_show'] / finished, 4) if finished else None,
+        'approval_rate': round((totals['approved'] or 0) / booked, 4) if booked else None,
+        'avg_approval_latency_seconds': round(totals['approval_latency_seconds'] / latency_count) if latency_count else None,
+    }
+
+
+@require_GET
+@staff_member_required
+def daily_stats(request):
+    """Per-day counters, optionally per appointment type (``?by=type``)."""
+    try:
+        provider_id = _provider_id(request)
+    except ValueError:
+        return _bad_provider()
+    start, end = _range(request)
+    qs = _scoped(DailyRollup.objects.filter(day__gte=start, day__lt=end), provider_id)
+    group = ('day', 'appointment_type') if request.GET.get('by') == 'type' else ('day',)
+    rows = qs.values(*group).order_by(*group).annotate(**{name: Sum(name) for name in COUNTERS})
+    return JsonResponse({
+        'from': start.isoformat(),
+        'to': (end - timedelta(days=1)).isoformat(),
+        'days': [{**{key: row[key] for key in group}, **_summary(row)} for row in rows],
+    })
+
+
+@require_GET
+@staff_member_required
+def summary_stats(request):
+    """Totals, utilization by appointment type and busiest local hours for a range."""
+    try:
+        provider_id = _provider_id(request)
+    except ValueError:
+        return _bad_provider()
+    start, end = _range(request)
+    daily = _scoped(DailyRollup.objects.filter(day__gte=start, day__lt=end), provider_id)
+    totals = daily.aggregate(**{name: Sum(name) for name in COUNTERS})
+    by_type = daily.values('appointment_type').order_by('appointment_type').annotate(
+        booked=Sum('booked'), booked_minutes=Sum('booked_minutes'))
+    all_minutes = totals['booked_minutes'] or 0
+
+    # busiest hours in the provider's zone (or the site zone across providers)
+    provider = User.objects.filter(id=provider_id).only('timezone').first() if provider_id is not None else None
+    tz = zone_named(provider.timezone) if provider else timezone.get_default_timezone()
+    since = any_zone_day_range(start)[0]
+    until = any_zone_day_range(end - timedelta(days=1))[1]
+    hourly = _scoped(HourlyRollup.objects.filter(hour__gte=since, hour__lt=until), provider_id)
+    per_hour = [0] * 24
+    for hour, booked in hourly.values('hour').order_by().annotate(n=Sum('booked')).values_list('hour', 'n'):
+        local = hour.astimezone(tz)
+        if start <= local.date() < end:
+            per_hour[local.hour] += booked
+    busiest = sorted(range(24), key=lambda h: per_hour[h], reverse=True)[:5]
+
+    return JsonResponse({
+        'from': start.isoformat(),
+        'to': (end - timedelta(days=1)).isoformat(),
+        'totals': _summary(totals),
+        'by_type': [{
+            'appointment_type': row['appointment_type'],
+            'booked': row['booked'],
+            'booked_minutes': row['booked_minutes'],
+            'share_of_minutes': round(row['booked_minutes'] / all_minutes, 4) if all_minutes else None,
+        } for row in by_type],
+        'busiest_hours': [{'hour': h, 'booked': per_hour[h]} for h in busiest if per_hour[h]],
+    })
@@ -0,0 +1,87 @@
+"""values_list()-based serialization for the JSON API.
+
+Each resource maps public field names to ORM paths. Only the requested
+fields (``?fields=``) are selected, rows come back as tuples without model
+instances, and datetimes are either left to ``JsonResponse`` (ISO 8601) or
+turned into epoch seconds with ``?time=epoch``.
+"""
+
+
+class ApiError(Exception):
+    pass
+
+
+class Resource:
+    def __init__(self, fields, datetime_fields=(), default_fields=None):
+        self.fields = fields
+        self.datetime_fields = frozenset(datetime_fields)
+        self.default_fields = tuple(default_fields or fields)
+
+    def selected_fields(self, request):
+        raw = request.GET.get('fields')
+        if not raw:
+            return self.default_fields
+        names = tuple(dict.fromkeys(n.strip() for n in raw.split(',') if n.strip()))
+        unknown = [n for n in names if n not in self.fields]
+        if unknown:
+            raise ApiError(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(self.fields)}")
+        return names or self.default_fields
+
+    def serialize(self, request, qs):
+        names = self.selected_fields(request)
+        rows = qs.values_list(*(self.fields[n] for n in names))
+        epoch = request.GET.get('time') == 'epoch'
+        convert = [i for i, n in enumerate(names) if n in self.datetime_fields] if epoch else []
+        if not convert:
+            return [dict(zip(names, row)) for row in rows]
+        out = []
+        for row in rows:
+            row = list(row)
+            for i in convert:
+                if row[i] is not None:
+                    row[i] = int(row[i].timestamp())
+            out.append(dict(zip(names, row)))
+        return out
+
+
+PROVIDERS = Resource(
+    {
+        'id': 'id',
+        'username': 'username',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+        'specialty': 'specialty',
+        'timezone': 'timezone',
+    },
+)
+
+SLOTS = Resource(
+    {
+        'id': 'id',
+        'provider': 'provider_id',
+        'start': 'start_time',
+        'end': 'end_time',
+        'booked': 'is_booked',
+        'updated': 'updated_at',
+    },
+    datetime_fields=('start', 'end', 'updated'),
+    default_fields=('id', 'provider', 'start', 'end', 'booked'),
+)
+
+APPOINTMENTS = Resource(
+    {
+        'id': 'id',
+        'slot': 'slot_id',
+        'provider': 'slot__provider_id',
+        'customer': 'customer_id',
+        'start': 'slot__start_time',
+        'end': 'slot__end_time',
+        'status': 'status',
+        'type': 'appointment_type',
+        'notes': 'patient_notes',
+        'created': 'created_at',
+        'updated': 'updated_at',
+    },
+    datetime_fields=('start', 'end', 'created', 'updated'),
+    default_fields=('id', 'slot', 'provider', 'customer', 'start', 'end', 'status', 'type'),
+)
@@ -0,0 +1,12 @@
+from django.urls import include, path
+from . import views
+
+v1_patterns = [
+    path('providers/', views.providers, name='providers'),
+    path('slots/', views.slots, name='slots'),
+    path('appointments/', views.appointments, name='appointments'),
+]
+
+urlpatterns = [
+    path('v1/', include((v1_patterns, 'v1'))),
+]
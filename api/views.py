@@ -0,0 +1,136 @@
+from datetime import time
+from functools import wraps
+
+from django.db.models import Q
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from accounts.models import User
+from bookings import slot_index
+from bookings.models import Slot, Appointment
+from bookings.timeutils import parse_day, provider_day_range
+from config.ids import MAX_DB_INT, parse_db_int
+from config.replicas import replica_reads
+from .serializers import ApiError, PROVIDERS, SLOTS, APPOINTMENTS
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+MAX_IDS = 100
+
+
+def api_view(view_func):
+    """Session auth with JSON errors instead of login redirects."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'error': 'Authentication required'}, status=401)
+        try:
+            return view_func(request, *args, **kwargs)
+        except ApiError as exc:
+            return JsonResponse({'error': str(exc)}, status=400)
+    return wrapper
+
+
+def _ids(request):
+    raw = request.GET.get('ids')
+    if not raw:
+        return None
+    try:
+        ids = [parse_db_int(i) for i in raw.split(',') if i.strip()]
+    except ValueError:
+        raise ApiError('ids must be a comma-separated list of integers')
+    if len(ids) > MAX_IDS:
+        raise ApiError(f'At most {MAX_IDS} ids per request')
+    return ids
+
+
+def _page(request, qs):
+    try:
+        limit = min(int(request.GET.get('limit', DEFAULT_LIMIT)), MAX_LIMIT)
+        offset = min(max(parse_db_int(request.GET.get('offset', 0)), 0), MAX_DB_INT - MAX_LIMIT)
+    except ValueError:
+        raise ApiError('limit and offset must be integers')
+    return qs[offset:offset + max(limit, 0)], limit, offset
+
+
+def _list_response(request, resource, qs):
+    ids = _ids(request)
+    if ids is not None:
+        qs = qs.filter(id__in=ids)
+        return JsonResponse({'results': resource.serialize(request, qs)})
+    page, limit, offset = _page(request, qs)
+    results = resource.serialize(request, page)
+    return JsonResponse({'results': results, 'limit': limit, 'offset': offset})
+
+
+@require_GET
+@api_view
+@replica_reads
+def providers(request):
+    qs = User.objects.filter(role='provider').order_by('id')
+    q = request.GET.get('q')
+    if q:
+        qs = qs.filter(Q(username__icontains=q) | Q(specialty__icontains=q))
+    if request.GET.get('free_on'):
+        qs = _with_free_slot(request, qs)
+    return _list_response(request, PROVIDERS, qs)
+
+
+def _local_time(request, name, default):
+    raw = request.GET.get(name)
+    if not raw:
+        return default
+    try:
+        return time.fromisoformat(raw)
+    except ValueError:
+        raise ApiError(f'{name} must be HH:MM')
+
+
+def _with_free_slot(request, qs):
+    """Keep providers with a free slot starting on local day ``free_on`` between ``free_from`` and ``free_to``."""
+    day = parse_day(request.GET['free_on'])
+    if day is None:
+        raise ApiError('free_on must be YYYY-MM-DD')
+    start = _local_time(request, 'free_from', time.min)
+    end = _local_time(request, 'free_to', None)
+    ids = slot_index.providers_with_free_slot(qs.only('id', 'timezone'), day, start, end)
+    return qs.filter(id__in=ids)
+
+
+@require_GET
+@api_view
+@replica_reads
+def slots(request):
+    """Slots for ``?provider=`` (optionally one local ``?date=``) or an ``?ids=`` batch."""
+    qs = Slot.objects.order_by('start_time')
+    if request.GET.get('ids'):
+        return _list_response(request, SLOTS, qs)
+    try:
+        provider_id = parse_db_int(request.GET.get('provider', ''))
+    except ValueError:
+        raise ApiError('provider (or ids) is required')
+    provider = User.objects.filter(id=provider_id, role='provider').only('id', 'timezone').first()
+    if provider is None:
+        raise ApiError('Unknown provider')
+    qs = qs.filter(provider=provider)
+    if request.GET.get('free') != '0':
+        qs = qs.filter(is_booked=False)
+    day = parse_day(request.GET.get('date'))
+    if day:
+        start, end = provider_day_range(provider, day)
+        qs = qs.filter(start_time__gte=start, start_time__lt=end)
+    return _list_response(request, SLOTS, qs)
+
+
+@require_GET
+@api_view
+@replica_reads
+def appointments(request):
+    """The caller's appointments; ``?mode=provider`` lists appointments on their slots."""
+    if request.user.is_provider() and request.GET.get('mode') == 'provider':
+        qs = Appointment.objects.filter(slot__provider=request.user)
+    else:
+        qs = Appointment.objects.filter(customer=request.user)
+    if request.GET.get('status'):
+        qs = qs.filter(status__in=request.GET['status'].split(','))
+    return _list_response(request, APPOINTMENTS, qs.order_by('-slot__start_time'))
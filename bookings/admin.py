@@ -1,13 +1,128 @@
+"""Admin for the slot and appointment tables.
+
+Both tables grow without bound, so the changelists avoid anything that
+scales with the table or with the user count: related objects in
+``list_display`` come from ``list_select_related`` joins, the count is
+estimated (``config.paginators``), ``date_hierarchy`` narrows by indexed
+datetime ranges, and users are picked through the admin autocomplete view
+rather than listed in the filter sidebar.
+"""
 from django.contrib import admin
+from django.urls import reverse
+
+from accounts.models import User
+from config.ids import parse_db_int
+from config.paginators import EstimatedCountPaginator
 from .models import Slot, Appointment
 
+
+class AutocompleteFilter(admin.SimpleListFilter):
+    """Sidebar filter on a user foreign key, searched with select2.
+
+    ``source`` names the model/field the admin autocomplete view should
+    resolve (it must be a direct foreign key); ``field_path`` is the ORM path
+    the changelist is filtered on.
+    """
+    template = 'admin/autocomplete_filter.html'
+    source = None
+    field_path = None
+
+    def user_id(self):
+        """The selected user id, or ``None`` when nothing (or garbage) is selected."""
+        value = self.value()
+        try:
+            return parse_db_int(value) if value else None
+        except ValueError:
+            return None
+
+    def lookups(self, request, model_admin):
+        # only the selected user, so the sidebar shows its name
+        user_id = self.user_id()
+        if user_id is not None:
+            user = User.objects.filter(pk=user_id).first()
+            if user is not None:
+                return [(self.value(), str(user))]
+        return []
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        if not self.value():
+            return queryset
+        user_id = self.user_id()
+        if user_id is None:
+            # no user has that id
+            return queryset.none()
+        return queryset.filter(**{f'{self.field_path}_id': user_id})
+
+    def autocomplete_attrs(self):
+        model, field_name = self.source
+        return {
+            'url': reverse('admin:autocomplete'),
+            'app_label': model._meta.app_label,
+            'model_name': model._meta.model_name,
+            'field_name': field_name,
+        }
+
+    def choices(self, changelist):
+        yield {
+            'selected': self.lookup_choices[0] if self.lookup_choices else None,
+            'clear_url': changelist.get_query_string(remove=[self.parameter_name, 'p']),
+            'autocomplete': self.autocomplete_attrs(),
+        }
+
+
+class SlotProviderFilter(AutocompleteFilter):
+    title = 'provider'
+    parameter_name = 'provider'
+    source = (Slot, 'provider')
+    field_path = 'provider'
+
+
+class AppointmentProviderFilter(AutocompleteFilter):
+    title = 'provider'
+    parameter_name = 'provider'
+    source = (Slot, 'provider')
+    field_path = 'slot__provider'
+
+
+class AppointmentCustomerFilter(AutocompleteFilter):
+    title = 'customer'
+    parameter_name = 'customer'
+    source = (Appointment, 'customer')
+    field_path = 'customer'
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    class Media:
+        css = {'all': ('admin/css/vendor/select2/select2.css', 'admin/css/autocomplete.css')}
+        js = (
+            'admin/js/vendor/jquery/jquery.js',
+            'admin/js/vendor/select2/select2.full.js',
+            'admin/js/jquery.init.js',
+            'admin/js/autocomplete.js',
+            'js/admin_autocomplete_filter.js',
+        )
+
+
 @admin.register(Slot)
-class SlotAdmin(admin.ModelAdmin):
+class SlotAdmin(LargeTableAdmin):
     list_display = ('provider', 'start_time', 'end_time', 'is_booked')
-    list_filter = ('provider', 'is_booked')
+    list_select_related = ('provider',)
+    list_filter = (SlotProviderFilter, 'is_booked')
+    date_hierarchy = 'start_time'
+    autocomplete_fields = ('provider',)
 
 @admin.register(Appointment)
-class AppointmentAdmin(admin.ModelAdmin):
+class AppointmentAdmin(LargeTableAdmin):
     list_display = ('slot', 'customer', 'status', 'created_at')
-    list_filter = ('status',)
+    list_select_related = ('slot__provider', 'customer')
+    list_filter = (AppointmentProviderFilter, AppointmentCustomerFilter, 'status')
     search_fields = ('customer__username', 'slot__provider__username')
+    date_hierarchy = 'created_at'
+    autocomplete_fields = ('customer',)
+    raw_id_fields = ('slot',)
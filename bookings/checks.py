@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# backends whose entries live in one worker process
+PER_PROCESS_CACHES = ('django.core.cache.backends.locmem.LocMemCache',)
+
+
+@register()
+def slot_index_cache_is_shared(app_configs, **kwargs):
+    if not settings.SLOT_INDEX_ENABLED:
+        return []
+    backend = settings.CACHES.get(settings.SLOT_INDEX_CACHE, {}).get('BACKEND')
+    if backend not in PER_PROCESS_CACHES:
+        return []
+    return [Warning(
+        'SLOT_INDEX_ENABLED is set but the slot_index cache is per process.',
+        hint='Bookings only invalidate the worker that handled them, so other workers answer '
+             'from stale bitmaps for up to SLOT_INDEX_TIMEOUT. Set CACHE_REDIS_URL, or run one worker.',
+        id='bookings.W001',
+    )]
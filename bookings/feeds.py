@@ -0,0 +1,307 @@
+"""Per-user iCalendar feeds and the incremental change endpoint backing them.
+
+Calendar apps cannot log in, so every feed URL carries a token that
+identifies the user, signed with their ``feed_secret``; ``reset_feed`` gives
+the user a new secret, which revokes every URL handed out before. The ICS feeds are streamed straight from a queryset
+iterator and answer conditional GETs with an ETag derived from a cheap
+aggregate, so clients polling every few minutes usually get a 304. Clients
+that want incremental sync call ``feed_changes`` with the ``sync_token`` from
+their previous response and receive only rows touched since then, plus
+tombstones for anything deleted.
+
+``updated_at`` is taken before a write commits, so a row can become visible
+with a timestamp older than the previous poll. The token therefore trails the
+poll by ``SYNC_LAG``. Rows from that window are sent again on the next poll,
+and clients de-duplicate them by id.
+
+Tombstones are kept for ``FEED_TOMBSTONE_DAYS`` (``prune_feed_tombstones``);
+a ``since`` older than that gets a 410 and the client starts over with a full
+sync, so pruning never hides a deletion.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth.decorators import login_required
+from django.core import signing
+from django.db.models import Count, Max
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import redirect
+from django.utils import timezone
+from django.views.decorators.http import condition, require_GET, require_POST
+
+from accounts.models import User, new_feed_secret
+from config.ids import parse_db_int
+from .models import Slot, Appointment, FeedTombstone
+
+FEED_SALT = 'bookings.feeds'
+FEED_HISTORY_DAYS = 30
+# longer than any booking transaction; rows this recent are sent twice
+SYNC_LAG = timedelta(minutes=2)
+FEED_TOMBSTONE_DAYS = 30
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+ICS_STATUS = {
+    'pending': 'TENTATIVE',
+    'approved': 'CONFIRMED',
+    'completed': 'CONFIRMED',
+    'no_show': 'CONFIRMED',
+    'rejected': 'CANCELLED',
+    'cancelled': 'CANCELLED',
+}
+
+
+def _feed_signer(user):
+    return signing.Signer(salt=f'{FEED_SALT}:{user.feed_secret}')
+
+
+def feed_token(user):
+    return _feed_signer(user).sign(str(user.pk))
+
+
+def _feed_user(token):
+    user_id = token.partition(':')[0]
+    try:
+        user = User.objects.filter(pk=parse_db_int(user_id), is_active=True).first()
+    except ValueError:
+        user = None
+    if user is None:
+        raise Http404('Unknown feed')
+    try:
+        _feed_signer(user).unsign(token)
+    except signing.BadSignature:
+        raise Http404('Unknown feed')
+    return user
+
+
+def encode_sync_token(moment):
+    return str((moment - EPOCH) // timedelta(microseconds=1))
+
+
+def decode_sync_token(token):
+    return EPOCH + timedelta(microseconds=int(token))
+
+
+def _user_appointments(user):
+    if user.is_provider():
+        return Appointment.objects.filter(slot__provider=user)
+    return Appointment.objects.filter(customer=user)
+
+
+def _user_tombstones(user):
+    if user.is_provider():
+        return FeedTombstone.objects.filter(provider=user)
+    return FeedTombstone.objects.filter(customer=user, kind='appointment')
+
+
+def _window_start():
+    return timezone.now() - timedelta(days=FEED_HISTORY_DAYS)
+
+
+def _tombstone_cutoff():
+    return timezone.now() - timedelta(days=FEED_TOMBSTONE_DAYS)
+
+
+def prune_tombstones():
+    """Delete tombstones past the retention window; returns how many."""
+    deleted, _ = FeedTombstone.objects.filter(deleted_at__lt=_tombstone_cutoff()).delete()
+    return deleted
+
+
+def _etag_for(qs):
+    stats = qs.aggregate(n=Count('id'), last=Max('updated_at'))
+    last = encode_sync_token(stats['last']) if stats['last'] else '0'
+    return f"{stats['n']}-{last}"
+
+
+# --- iCalendar serialization -------------------------------------------------
+
+def _ics_time(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _ics_text(value):
+    return (value.replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _ics_line(line):
+    # RFC 5545: fold content lines longer than 75 octets
+    raw = line.encode('utf-8')
+    if len(raw) <= 75:
+        return line + '\r\n'
+    parts = []
+    limit = 75
+    while raw:
+        cut = min(limit, len(raw))
+        while cut < len(raw) and (raw[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(raw[:cut].decode('utf-8'))
+        raw = raw[cut:]
+        limit = 74
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _ics_calendar(name, events):
+    yield _ics_line('BEGIN:VCALENDAR')
+    yield _ics_line('VERSION:2.0')
+    yield _ics_line('PRODID:-//Schedulify Pro//Bookings//EN')
+    yield _ics_line('CALSCALE:GREGORIAN')
+    yield _ics_line('METHOD:PUBLISH')
+    yield _ics_line(f'X-WR-CALNAME:{_ics_text(name)}')
+    for event in events:
+        yield _ics_line('BEGIN:VEVENT')
+        for key, value in event:
+            yield _ics_line(f'{key}:{value}')
+        yield _ics_line('END:VEVENT')
+    yield _ics_line('END:VCALENDAR')
+
+
+def _appointment_events(user, rows):
+    as_provider = user.is_provider()
+    for row in rows:
+        kind = row['appointment_type'].replace('_', ' ').title()
+        if as_provider:
+            summary = f"{kind}: {row['customer__first_name'] or row['customer__username']}"
+        else:
+            summary = f"{kind} with Dr. {row['slot__provider__first_name'] or row['slot__provider__username']}"
+        event = [
+            ('UID', f"appointment-{row['id']}@schedulify"),
+            ('DTSTAMP', _ics_time(row['updated_at'])),
+            ('LAST-MODIFIED', _ics_time(row['updated_at'])),
+            ('DTSTART', _ics_time(row['slot__start_time'])),
+            ('DTEND', _ics_time(row['slot__end_time'])),
+            ('SUMMARY', _ics_text(summary)),
+            ('STATUS', ICS_STATUS.get(row['status'], 'TENTATIVE')),
+        ]
+        if as_provider and row['patient_notes']:
+            event.append(('DESCRIPTION', _ics_text(row['patient_notes'])))
+        yield event
+
+
+def _slot_events(rows):
+    for row in rows:
+        yield [
+            ('UID', f"slot-{row['id']}@schedulify"),
+            ('DTSTAMP', _ics_time(row['updated_at'])),
+            ('LAST-MODIFIED', _ics_time(row['updated_at'])),
+            ('DTSTART', _ics_time(row['start_time'])),
+            ('DTEND', _ics_time(row['end_time'])),
+            ('SUMMARY', 'Open slot'),
+            ('TRANSP', 'TRANSPARENT'),
+        ]
+
+
+APPOINTMENT_FIELDS = (
+    'id', 'status', 'appointment_type', 'patient_notes', 'updated_at',
+    'slot_id', 'slot__start_time', 'slot__end_time',
+    'slot__provider__username', 'slot__provider__first_name',
+    'customer__username', 'customer__first_name',
+)
+SLOT_FIELDS = ('id', 'start_time', 'end_time', 'is_booked', 'updated_at')
+
+
+def _feed_appointments(user):
+    return _user_appointments(user).filter(slot__start_time__gte=_window_start())
+
+
+def _feed_slots(user):
+    if not user.is_provider():
+        raise Http404('Slot feeds are only available to providers')
+    return Slot.objects.filter(provider=user, is_booked=False, start_time__gte=_window_start())
+
+
+def _appointments_etag(request, token):
+    return _etag_for(_feed_appointments(_feed_user(token)))
+
+
+def _slots_etag(request, token):
+    return _etag_for(_feed_slots(_feed_user(token)))
+
+
+def _ics_response(stream, filename):
+    response = StreamingHttpResponse(stream, content_type='text/calendar; charset=utf-8')
+    response['Content-Disposition'] = f'inline; filename="{filename}"'
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+# --- views -------------------------------------------------------------------
+
+@require_GET
+@condition(etag_func=_appointments_etag)
+def appointments_feed(request, token):
+    user = _feed_user(token)
+    rows = (_feed_appointments(user).order_by('slot__start_time')
+            .values(*APPOINTMENT_FIELDS).iterator(chunk_size=500))
+    stream = _ics_calendar(f'Schedulify appointments ({user.username})', _appointment_events(user, rows))
+    return _ics_response(stream, 'appointments.ics')
+
+
+@require_GET
+@condition(etag_func=_slots_etag)
+def slots_feed(request, token):
+    user = _feed_user(token)
+    rows = _feed_slots(user).order_by('start_time').values(*SLOT_FIELDS).iterator(chunk_size=500)
+    stream = _ics_calendar(f'Schedulify open slots ({user.username})', _slot_events(rows))
+    return _ics_response(stream, 'slots.ics')
+
+
+@login_required
+@require_POST
+def reset_feed(request):
+    """Give the user a new feed secret, so every old feed URL stops working."""
+    request.user.feed_secret = new_feed_secret()
+    request.user.save(update_fields=['feed_secret'])
+    return redirect('dashboard')
+
+
+@require_GET
+def feed_changes(request, token):
+    """JSON delta of appointments/slots touched after ``since`` (a previous ``sync_token``)."""
+    user = _feed_user(token)
+    high_water = timezone.now() - SYNC_LAG
+    since = request.GET.get('since')
+    appointments = _user_appointments(user)
+    slots = Slot.objects.filter(provider=user) if user.is_provider() else Slot.objects.none()
+    tombstones = _user_tombstones(user)
+    if since:
+        try:
+            since_dt = decode_sync_token(since)
+        except (ValueError, OverflowError):
+            return JsonResponse({'error': 'Invalid sync token'}, status=400)
+        if since_dt < _tombstone_cutoff():
+            return JsonResponse({'error': 'Sync token expired, sync again without since'}, status=410)
+        appointments = appointments.filter(updated_at__gt=since_dt)
+        slots = slots.filter(updated_at__gt=since_dt)
+        tombstones = tombstones.filter(deleted_at__gt=since_dt)
+    else:
+        # initial sync: same window as the ICS feeds, no tombstones needed
+        appointments = appointments.filter(slot__start_time__gte=_window_start())
+        slots = slots.filter(is_booked=False, start_time__gte=_window_start())
+        tombstones = tombstones.none()
+
+    appointment_rows = list(appointments.order_by('updated_at').values(*APPOINTMENT_FIELDS))
+    slot_rows = list(slots.order_by('updated_at').values(*SLOT_FIELDS))
+    deleted = {'appointments': [], 'slots': []}
+    for kind, object_id in tombstones.values_list('kind', 'object_id'):
+        deleted[f'{kind}s'].append(object_id)
+
+    return JsonResponse({
+        'appointments': [{
+            'id': a['id'],
+            'slot': a['slot_id'],
+            'start': a['slot__start_time'].isoformat(),
+            'end': a['slot__end_time'].isoformat(),
+            'status': a['status'],
+            'appointment_type': a['appointment_type'],
+            'provider': a['slot__provider__username'],
+            'customer': a['customer__username'],
+        } for a in appointment_rows],
+        'slots': [{
+            'id': s['id'],
+            'start': s['start_time'].isoformat(),
+            'end': s['end_time'].isoformat(),
+            'is_booked': s['is_booked'],
+        } for s in slot_rows],
+        'deleted': deleted,
+        'sync_token': encode_sync_token(high_water),
+    })
@@ -0,0 +1,113 @@
+"""Compare the read-heavy booking endpoints under WSGI threads and ASGI.
+
+Sends the same batch of GETs (provider slots page, slot JSON API, booking
+wizard) through Django's WSGI handler from a thread pool and through the
+ASGI handler as concurrent coroutines, then reports requests per second and
+the traced Python memory peak per in-flight request. Thread stacks are not
+visible to tracemalloc, so the WSGI figure is a lower bound.
+
+    python manage.py bench_async --concurrency 50 --requests 600
+"""
+import asyncio
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import AsyncClient, Client, override_settings
+from django.utils import timezone
+
+from accounts.models import User
+from bookings.models import Slot
+
+
+def _measure(run):
+    """Time one untraced pass, then repeat it under tracemalloc for the memory peak."""
+    began = time.perf_counter()
+    statuses = run()
+    elapsed = time.perf_counter() - began
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statuses, elapsed, peak
+
+
+class Command(BaseCommand):
+    help = 'Benchmark async booking read views under ASGI against the WSGI thread path.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--requests', type=int, default=300)
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        provider = User.objects.create_user(f'bench-provider-{tag}', role='provider')
+        customer = User.objects.create_user(f'bench-customer-{tag}')
+        start = timezone.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+        Slot.objects.bulk_create([
+            Slot(provider=provider, start_time=start + timedelta(minutes=30 * i),
+                 end_time=start + timedelta(minutes=30 * (i + 1)))
+            for i in range(40)
+        ])
+        day = timezone.localdate(start).isoformat()
+        paths = [
+            f'/bookings/providers/{provider.id}/slots/',
+            f'/bookings/api/providers/{provider.id}/slots/?date={day}',
+            f'/bookings/book/?provider={provider.id}&date={day}',
+        ]
+        urls = [paths[i % len(paths)] for i in range(options['requests'])]
+        concurrency = options['concurrency']
+
+        login = Client()
+        login.force_login(customer)
+        cookies = login.cookies
+
+        try:
+            # the test clients always send Host: testserver
+            with override_settings(ALLOWED_HOSTS=['testserver']):
+                self._report('wsgi (threads)', concurrency, *self._run_wsgi(urls, cookies, concurrency))
+                self._report('asgi (async)', concurrency, *self._run_asgi(urls, cookies, concurrency))
+        finally:
+            provider.delete()
+            customer.delete()
+
+    def _run_wsgi(self, urls, cookies, concurrency):
+        def fetch(url):
+            client = Client()
+            client.cookies = cookies
+            try:
+                return client.get(url).status_code
+            finally:
+                connection.close()
+
+        def run():
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                return list(pool.map(fetch, urls))
+
+        return _measure(run)
+
+    def _run_asgi(self, urls, cookies, concurrency):
+        async def run():
+            gate = asyncio.Semaphore(concurrency)
+
+            async def fetch(url):
+                async with gate:
+                    client = AsyncClient()
+                    client.cookies = cookies
+                    return (await client.get(url)).status_code
+
+            return await asyncio.gather(*(fetch(url) for url in urls))
+
+        return _measure(lambda: asyncio.run(run()))
+
+    def _report(self, label, concurrency, statuses, elapsed, peak):
+        ok = sum(1 for s in statuses if s == 200)
+        self.stdout.write(
+            f'{label:16} {ok}/{len(statuses)} ok  '
+            f'{len(statuses) / elapsed:8.1f} req/s  '
+            f'{peak / concurrency / 1024:8.1f} KiB/connection (traced peak)'
+        )
@@ -0,0 +1,92 @@
+"""Measure concurrent booking throughput against the configured database.
+
+Run it once per database profile to compare, e.g.::
+
+    DB_ENGINE=sqlite_plain python manage.py bench_bookings
+    DB_ENGINE=sqlite python manage.py bench_bookings
+
+The command creates a throwaway provider with free slots and one customer
+per thread, books the slots from the threads through the same write path as
+``book_slot`` (conditional UPDATE claim, appointment, rollup and preference
+updates in one transaction) and removes everything it created afterwards.
+"""
+import queue
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, transaction
+from django.utils import timezone
+
+from accounts.models import User
+from analytics.rollups import record_transition
+from bookings.models import Slot, Appointment
+from bookings.recommendations import record_preference
+from bookings.views import _claim_slot
+
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent booking throughput on the default database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--slots', type=int, default=400)
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        provider = User.objects.create_user(f'bench-provider-{tag}', role='provider')
+        customers = [User.objects.create_user(f'bench-customer-{tag}-{i}') for i in range(options['threads'])]
+        start = timezone.now().replace(microsecond=0) + timedelta(days=365)
+        Slot.objects.bulk_create([
+            Slot(provider=provider, start_time=start + timedelta(minutes=15 * i),
+                 end_time=start + timedelta(minutes=15 * (i + 1)))
+            for i in range(options['slots'])
+        ])
+        pending = queue.Queue()
+        for slot_id in Slot.objects.filter(provider=provider).values_list('id', flat=True):
+            pending.put(slot_id)
+
+        booked = []
+        errors = []
+
+        def worker(customer):
+            try:
+                while True:
+                    try:
+                        slot_id = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        slot = Slot.objects.select_related('provider').get(id=slot_id, is_booked=False)
+                        with transaction.atomic():
+                            if not _claim_slot(slot):
+                                continue
+                            appointment = Appointment.objects.create(slot=slot, customer=customer)
+                            record_transition(appointment, 'pending')
+                            record_preference(appointment, 'pending')
+                        booked.append(slot_id)
+                    except OperationalError as exc:
+                        errors.append(str(exc))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(customer,)) for customer in customers]
+        began = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - began
+
+        try:
+            vendor = connection.settings_dict['ENGINE']
+            self.stdout.write(f'engine:     {vendor}')
+            self.stdout.write(f'threads:    {options["threads"]}')
+            self.stdout.write(f'booked:     {len(booked)}/{options["slots"]} in {elapsed:.2f}s')
+            self.stdout.write(f'throughput: {len(booked) / elapsed:.1f} bookings/s')
+            self.stdout.write(f'errors:     {len(errors)}' + (f' (e.g. "{errors[0]}")' if errors else ''))
+        finally:
+            provider.delete()
+            User.objects.filter(id__in=[c.id for c in customers]).delete()
@@ -0,0 +1,115 @@
+"""Compare free-slot queries through the bitmap index with the ORM path.
+
+Creates throwaway providers with a working day of 30-minute slots (part of
+them booked) for a number of days, then times
+
+* "which providers have a free slot on day D between 13:00 and 17:00", and
+* "first free slot start of every provider after X" (bits only), and
+* "first free slot row of one provider after X" (bits plus one lookup),
+
+through ``bookings.slot_index`` (warm cache) and the equivalent ORM queries,
+checks both give the same answers, books some slots through the index
+maintenance hooks and finally runs the consistency check::
+
+    python manage.py bench_slot_index --providers 200 --days 14
+"""
+import random
+import time
+import uuid
+from datetime import time as dt_time, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from django.utils import timezone
+
+from accounts.models import User
+from bookings import slot_index
+from bookings.models import Slot
+from bookings.timeutils import local_datetime, user_timezone
+
+
+def _timed(run, repeat):
+    began = time.perf_counter()
+    for _ in range(repeat):
+        result = run()
+    return result, (time.perf_counter() - began) / repeat * 1000
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the free-slot bitmap index against the ORM queries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--providers', type=int, default=200)
+        parser.add_argument('--days', type=int, default=14)
+        parser.add_argument('--booked', type=float, default=0.7, help='share of slots already booked')
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        tag = uuid.uuid4().hex[:8]
+        User.objects.bulk_create([
+            User(username=f'bench-idx-{tag}-{i}', role='provider') for i in range(options['providers'])
+        ])
+        providers = list(User.objects.filter(username__startswith=f'bench-idx-{tag}-').only('id', 'timezone'))
+        first_day = timezone.localdate() + timedelta(days=1)
+        days = [first_day + timedelta(days=i) for i in range(options['days'])]
+        slots = []
+        for provider in providers:
+            tz = user_timezone(provider)
+            for day in days:
+                opening = local_datetime(day, dt_time(9), tz)
+                for i in range(16):
+                    start = opening + timedelta(minutes=30 * i)
+                    slots.append(Slot(provider=provider, start_time=start, end_time=start + timedelta(minutes=30),
+                                      is_booked=rng.random() < options['booked']))
+        Slot.objects.bulk_create(slots, batch_size=2000)
+        self.stdout.write(f'{len(providers)} providers x {len(days)} days, {len(slots)} slots')
+
+        cache = slot_index._cache()
+        keys = [make_key(p.id, day) for p in providers for day in days
+                for make_key in (slot_index._key, slot_index._version_key)]
+        repeat = options['repeat']
+        try:
+            with override_settings(SLOT_INDEX_ENABLED=True):
+                began = time.perf_counter()
+                slot_index.bitmaps(providers, days)
+                self.stdout.write(f'index build (cold):         {(time.perf_counter() - began) * 1000:8.2f} ms')
+
+                day = days[len(days) // 2]
+                afternoon = (day, dt_time(13), dt_time(17))
+                orm_ids, orm_ms = _timed(lambda: slot_index.orm_providers_with_free_slot(providers, *afternoon), repeat)
+                idx_ids, idx_ms = _timed(lambda: slot_index.providers_with_free_slot(providers, *afternoon), repeat)
+                self._report('free on an afternoon', orm_ms, idx_ms, sorted(orm_ids) == sorted(idx_ids))
+
+                after = local_datetime(days[2], dt_time(12, 10), user_timezone(providers[0]))
+                orm_first, orm_ms = _timed(lambda: slot_index.orm_first_free_starts(providers, after), repeat)
+                idx_first, idx_ms = _timed(lambda: slot_index.first_free_starts(providers, after), repeat)
+                self._report('first free start, all', orm_ms, idx_ms, orm_first == idx_first)
+
+                sample = providers[:50]
+                orm_first, orm_ms = _timed(
+                    lambda: [getattr(slot_index.orm_first_free_after(p, after), 'id', None) for p in sample], repeat)
+                idx_first, idx_ms = _timed(
+                    lambda: [getattr(slot_index.first_free_after(p, after), 'id', None) for p in sample], repeat)
+                self._report(f'first free slot row x{len(sample)}', orm_ms, idx_ms, orm_first == idx_first)
+
+                # book some free slots the way the booking view does, then verify
+                free = list(Slot.objects.filter(provider__in=providers, is_booked=False)
+                            .select_related('provider').order_by('?')[:100])
+                for slot in free:
+                    with transaction.atomic():
+                        Slot.objects.filter(id=slot.id, is_booked=False).update(is_booked=True)
+                        slot.is_booked = True
+                        slot_index.slot_changed(slot)
+                wrong = slot_index.check(providers, days)
+                self.stdout.write(f'consistency after {len(free)} bookings: {len(wrong)} mismatched provider-days')
+        finally:
+            cache.delete_many(keys)
+            User.objects.filter(id__in=[p.id for p in providers]).delete()
+
+    def _report(self, label, orm_ms, idx_ms, same):
+        self.stdout.write(
+            f'{label:27} orm {orm_ms:8.2f} ms  index {idx_ms:8.2f} ms  '
+            f'x{orm_ms / idx_ms if idx_ms else float("inf"):.1f}  ' + ('same result' if same else 'RESULTS DIFFER')
+        )
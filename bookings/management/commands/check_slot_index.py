@@ -0,0 +1,57 @@
+"""Compare the cached free-slot bitmaps with the Slot table.
+
+Only provider-days present in the cache are checked. With the default
+local-memory cache that is this process's own (empty) cache, so point the
+``slot_index`` cache at Redis (``CACHE_REDIS_URL``) to check a running site::
+
+    python manage.py check_slot_index --days 14 --repair
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts.models import User
+from bookings import slot_index
+from bookings.timeutils import parse_day
+
+
+class Command(BaseCommand):
+    help = 'Report (and optionally fix) free-slot index entries that disagree with the database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='start', help='first day to check (YYYY-MM-DD), default: today')
+        parser.add_argument('--days', type=int, default=30)
+        parser.add_argument('--provider', type=int, action='append', help='limit to these provider ids')
+        parser.add_argument('--repair', action='store_true', help='overwrite wrong entries with the database state')
+
+    def handle(self, *args, **options):
+        first = parse_day(options['start']) if options['start'] else timezone.localdate()
+        if first is None:
+            raise CommandError('--from must be YYYY-MM-DD.')
+        days = [first + timedelta(days=i) for i in range(options['days'])]
+        providers = User.objects.filter(role='provider').only('id', 'timezone').order_by('id')
+        if options['provider']:
+            providers = providers.filter(id__in=options['provider'])
+
+        wrong = []
+        batch = []
+        for provider in providers.iterator(chunk_size=500):
+            batch.append(provider)
+            if len(batch) == 500:
+                wrong += slot_index.check(batch, days, repair=options['repair'])
+                batch = []
+        if batch:
+            wrong += slot_index.check(batch, days, repair=options['repair'])
+
+        by_id = {p.id: p for p in providers.filter(id__in={pid for pid, *_ in wrong})}
+        for provider_id, day, cached, actual in wrong:
+            provider = by_id[provider_id]
+            extra = ', '.join(f'{t:%H:%M}' for t in slot_index.bucket_times(provider, day, cached & ~actual))
+            missing = ', '.join(f'{t:%H:%M}' for t in slot_index.bucket_times(provider, day, actual & ~cached))
+            self.stdout.write(f'provider {provider_id} {day}: stale free [{extra}] missing free [{missing}]')
+        if wrong:
+            action = 'repaired' if options['repair'] else 'found'
+            self.stdout.write(self.style.WARNING(f'{len(wrong)} inconsistent provider-days {action}.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Free-slot index matches the database.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from bookings.feeds import FEED_TOMBSTONE_DAYS, prune_tombstones
+
+
+class Command(BaseCommand):
+    help = f'Delete calendar feed tombstones older than {FEED_TOMBSTONE_DAYS} days (run daily).'
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} feed tombstones.'))
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.7 on 2026-10-19 11:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_feeds'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerPreference',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour_weights', models.JSONField(default=list)),
+                ('weekday_weights', models.JSONField(default=list)),
+                ('bookings_counted', models.PositiveIntegerField(default=0)),
+                ('last_appointment_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('customer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='slot_preference', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.7 on 2026-10-19 11:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0006_appointment_no_show'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(fields=['created_at'], name='bookings_ap_created_c89e45_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='slot',
+            index=models.Index(fields=['start_time'], name='bookings_sl_start_t_b5ee2b_idx'),
+        ),
+    ]
@@ -1,7 +1,8 @@
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
-from datetime import datetime, timedelta
+from datetime import timedelta, timezone as dt_timezone
+from .timeutils import local_datetime, user_timezone
 
 User = settings.AUTH_USER_MODEL
 
@@ -10,10 +11,19 @@ class Slot(models.Model):
     start_time = models.DateTimeField()
     end_time = models.DateTimeField()
     is_booked = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['start_time']
         unique_together = ('provider', 'start_time')
+        indexes = [
+            models.Index(fields=['provider', 'updated_at']),
+            models.Index(fields=['start_time']),
+        ]
+
+    @property
+    def provider_tz(self):
+        return user_timezone(self.provider)
 
     def __str__(self):
         return f"{self.provider} {self.start_time:%Y-%m-%d %H:%M}" 
@@ -33,6 +43,7 @@ class Appointment(models.Model):
         ('rejected', 'Rejected'),
         ('cancelled', 'Cancelled'),
         ('completed', 'Completed'),
+        ('no_show', 'No-show'),
     )
     
     slot = models.OneToOneField(Slot, on_delete=models.CASCADE, related_name='appointment')
@@ -45,11 +56,39 @@ class Appointment(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['customer', 'updated_at']),
+            models.Index(fields=['created_at']),
+        ]
 
     def __str__(self):
         return f"{self.customer} -> {self.slot} ({self.status})"
 
 
+class FeedTombstone(models.Model):
+    """Records deleted slots/appointments so calendar deltas can report removals."""
+    KIND_CHOICES = (
+        ('slot', 'Slot'),
+        ('appointment', 'Appointment'),
+    )
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    provider = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    customer = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['deleted_at']
+        indexes = [
+            models.Index(fields=['provider', 'deleted_at']),
+            models.Index(fields=['customer', 'deleted_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
+
+
 class Availability(models.Model):
     provider = models.ForeignKey(User, on_delete=models.CASCADE, related_name='availabilities')
     date = models.DateField()
@@ -66,8 +105,10 @@ class Availability(models.Model):
         return f"{self.provider} {self.date} {self.start_time}-{self.end_time}"
 
     def generate_slots(self):
-        base_dt = datetime.combine(self.date, self.start_time)
-        end_dt = datetime.combine(self.date, self.end_time)
+        tz = user_timezone(self.provider)
+        # step in UTC so intervals stay exact across DST changes
+        base_dt = local_datetime(self.date, self.start_time, tz).astimezone(dt_timezone.utc)
+        end_dt = local_datetime(self.date, self.end_time, tz).astimezone(dt_timezone.utc)
         created = 0
         while base_dt < end_dt:
             next_dt = base_dt + timedelta(minutes=self.interval_minutes)
@@ -82,3 +123,22 @@ class Availability(models.Model):
             base_dt = next_dt
             created += 1
         return created
+
+
+class CustomerPreference(models.Model):
+    """Decayed histogram of when a customer books, in the customer's own zone.
+
+    Maintained by ``recommendations.record_preference`` from the booking and
+    status-change views. A new booking is folded in on its own, and
+    ``last_appointment_id`` marks the newest one counted. A rejection or
+    cancellation recounts the counted appointments from scratch.
+    """
+    customer = models.OneToOneField(User, on_delete=models.CASCADE, related_name='slot_preference')
+    hour_weights = models.JSONField(default=list)
+    weekday_weights = models.JSONField(default=list)
+    bookings_counted = models.PositiveIntegerField(default=0)
+    last_appointment_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Preferences of {self.customer} ({self.bookings_counted} bookings)"
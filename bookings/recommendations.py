@@ -0,0 +1,157 @@
+"""Top-k slot recommendations for a customer.
+
+Each free slot of a provider in the next ``HORIZON_DAYS`` gets a score from
+three parts:
+
+* preference: how often the customer booked that hour of day and weekday
+  (their ``CustomerPreference`` histogram, in the customer's zone);
+* load: how full the provider's day already is, since lighter days are preferred;
+* soonness: exponential decay over days ahead.
+
+One query loads every slot of the provider in the window, which gives both
+the candidates and the per-day load. The histograms are folded into one
+168-entry hour-of-week table and zone conversions are memoized per UTC
+quarter hour, so scoring a slot costs two lookups and an ``exp``; ``heapq.nlargest``
+keeps only the top k, whose end times are fetched afterwards.
+"""
+import heapq
+import math
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Appointment, CustomerPreference, Slot
+from .timeutils import user_timezone
+
+HORIZON_DAYS = 30
+DECAY = 0.9
+WEIGHT_PREFERENCE = 0.5
+WEIGHT_LOAD = 0.2
+WEIGHT_SOON = 0.3
+NEUTRAL_PREFERENCE = 0.5
+
+
+# statuses whose bookings say when the customer wants to come
+COUNTED_STATUSES = ('pending', 'approved', 'completed', 'no_show')
+
+
+def _fold(pref, customer, rows):
+    hours = pref.hour_weights or [0.0] * 24
+    weekdays = pref.weekday_weights or [0.0] * 7
+    tz = user_timezone(customer)
+    for appointment_id, start in rows:
+        # older bookings fade so changed habits win out
+        hours = [w * DECAY for w in hours]
+        weekdays = [w * DECAY for w in weekdays]
+        local = start.astimezone(tz)
+        hours[local.hour] += 1.0
+        weekdays[local.weekday()] += 1.0
+        pref.last_appointment_id = max(pref.last_appointment_id, appointment_id)
+    pref.hour_weights = hours
+    pref.weekday_weights = weekdays
+    pref.bookings_counted += len(rows)
+
+
+def _rebuild(pref, customer):
+    """Recount ``pref`` from every appointment of ``customer`` still in a counted status."""
+    pref.hour_weights, pref.weekday_weights = [], []
+    pref.bookings_counted = pref.last_appointment_id = 0
+    _fold(pref, customer, list(
+        Appointment.objects.filter(customer=customer, status__in=COUNTED_STATUSES)
+        .order_by('id').values_list('id', 'slot__start_time')
+    ))
+
+
+def record_preference(appointment, new_status):
+    """Update the customer's histogram for ``appointment`` entering ``new_status``.
+
+    Called next to ``record_transition`` by the booking and status-change
+    views. A new booking ('pending') is folded in on its own. Leaving the
+    counted statuses (rejected, cancelled) rebuilds the histogram without it,
+    and so does a booking that commits after a newer one was already folded.
+    Moves between counted statuses change nothing.
+    """
+    if new_status in COUNTED_STATUSES and new_status != 'pending':
+        return
+    customer = appointment.customer
+    with transaction.atomic():
+        pref, created = CustomerPreference.objects.select_for_update().get_or_create(customer=customer)
+        if new_status == 'pending' and not created and appointment.id > pref.last_appointment_id:
+            _fold(pref, customer, [(appointment.id, appointment.slot.start_time)])
+        else:
+            _rebuild(pref, customer)
+        pref.save()
+
+
+def customer_preference(customer):
+    """The stored histogram, or one computed in memory (not saved) if there is none yet."""
+    pref = CustomerPreference.objects.filter(customer=customer).first()
+    if pref is None:
+        pref = CustomerPreference(customer=customer)
+        _rebuild(pref, customer)
+    return pref
+
+
+def _hour_of_week_table(pref):
+    """168 preference scores in [0, 1], indexed by ``weekday * 24 + hour``."""
+    if not pref.bookings_counted:
+        return [NEUTRAL_PREFERENCE] * 168
+    hour_max = max(pref.hour_weights) or 1.0
+    day_max = max(pref.weekday_weights) or 1.0
+    hours = [w / hour_max for w in pref.hour_weights]
+    days = [w / day_max for w in pref.weekday_weights]
+    return [0.6 * hours[h] + 0.4 * days[d] for d in range(7) for h in range(24)]
+
+
+def recommend_slots(customer, provider, k=5, now=None):
+    now = now or timezone.now()
+    pref = customer_preference(customer)
+    table = _hour_of_week_table(pref)
+    customer_tz = user_timezone(customer)
+    provider_tz = user_timezone(provider)
+
+    # end_time is only needed for the winners, so skip converting it for every row
+    rows = list(
+        Slot.objects.filter(provider=provider, start_time__gte=now,
+                            start_time__lt=now + timedelta(days=HORIZON_DAYS))
+        .values_list('id', 'start_time', 'is_booked')
+    )
+
+    # zone conversions are shared by every slot in the same UTC quarter hour
+    # (the finest offset granularity in use, e.g. +05:45)
+    quarter_info = {}
+
+    def local_info(start):
+        bucket = int(start.timestamp()) // 900
+        info = quarter_info.get(bucket)
+        if info is None:
+            local = start.astimezone(customer_tz)
+            info = quarter_info[bucket] = (local.weekday() * 24 + local.hour, start.astimezone(provider_tz).date())
+        return info
+
+    totals = Counter()
+    booked = Counter()
+    for _, start, is_booked in rows:
+        day = local_info(start)[1]
+        totals[day] += 1
+        if is_booked:
+            booked[day] += 1
+    free_share = {day: 1.0 - booked[day] / totals[day] for day in totals}
+
+    decay_per_second = 1.0 / (HORIZON_DAYS * 86400 / 3)
+    now_ts = now.timestamp()
+
+    def scored():
+        for slot_id, start, is_booked in rows:
+            if is_booked:
+                continue
+            how, day = local_info(start)
+            soon = math.exp(-(start.timestamp() - now_ts) * decay_per_second)
+            score = WEIGHT_PREFERENCE * table[how] + WEIGHT_LOAD * free_share[day] + WEIGHT_SOON * soon
+            yield score, slot_id, start
+
+    top = heapq.nlargest(k, scored(), key=lambda item: item[0])
+    ends = dict(Slot.objects.filter(id__in=[slot_id for _, slot_id, _ in top]).values_list('id', 'end_time'))
+    return [(score, slot_id, start, ends[slot_id]) for score, slot_id, start in top]
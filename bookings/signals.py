@@ -0,0 +1,42 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from .models import Slot, Appointment, FeedTombstone
+
+
+def _deleted_user_id(origin):
+    """Id of the user whose deletion cascaded here (0 when it was a bulk user delete)."""
+    User = get_user_model()
+    if isinstance(origin, User):
+        return origin.pk
+    if getattr(origin, 'model', None) is User:
+        return 0
+    return None
+
+
+@receiver(post_delete, sender=Slot)
+def slot_deleted(sender, instance, origin=None, **kwargs):
+    # a provider's own feed disappears with them, no tombstone needed
+    if _deleted_user_id(origin) is not None:
+        return
+    FeedTombstone.objects.create(kind='slot', object_id=instance.pk, provider_id=instance.provider_id)
+
+
+@receiver(post_delete, sender=Appointment)
+def appointment_deleted(sender, instance, origin=None, **kwargs):
+    deleted_user_id = _deleted_user_id(origin)
+    if deleted_user_id == 0:
+        return
+    try:
+        provider_id = instance.slot.provider_id
+    except Slot.DoesNotExist:
+        return
+    if deleted_user_id == provider_id:
+        return
+    customer_id = instance.customer_id if deleted_user_id != instance.customer_id else None
+    FeedTombstone.objects.create(
+        kind='appointment',
+        object_id=instance.pk,
+        provider_id=provider_id,
+        customer_id=customer_id,
+    )
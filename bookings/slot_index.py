@@ -0,0 +1,341 @@
+"""Free-slot bitmap index per provider-day.
+
+Bit ``i`` of a provider-day entry is set when a free slot starts in the
+``i``-th ``STEP_MINUTES`` bucket after local midnight. Entries are stored as
+``(version, bits)`` and only trusted while the day's version counter is
+unchanged; the booking/slot/availability views bump it after commit, so the
+next query rebuilds the day. The ``slot_index`` cache must be shared by all
+workers (``bookings.W001``). A set bit means a free slot *probably* starts
+there: ``first_free_after`` confirms it, and booking still claims slots with a
+conditional UPDATE.
+"""
+import time as clock
+from collections import defaultdict
+from datetime import time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Min, Q
+
+from .models import Slot
+from .timeutils import any_zone_day_range, day_range, local_datetime, user_timezone
+
+STEP_MINUTES = 5
+STEP = timedelta(minutes=STEP_MINUTES)
+
+
+def enabled():
+    return settings.SLOT_INDEX_ENABLED
+
+
+def _cache():
+    return caches[settings.SLOT_INDEX_CACHE]
+
+
+def _key(provider_id, day):
+    return f'{provider_id}:{day.isoformat()}'
+
+
+def _version_key(provider_id, day):
+    return f'v:{provider_id}:{day.isoformat()}'
+
+
+def _current(cache, pairs):
+    """Versions of ``pairs`` and the cached bitmaps that still match them.
+
+    Missing counters are started here, before the caller loads any rows.
+    """
+    version_keys = {_version_key(*pair): pair for pair in pairs}
+    found = cache.get_many([*version_keys, *(_key(*pair) for pair in pairs)])
+    unversioned = [key for key in version_keys if key not in found]
+    if unversioned:
+        # Overwriting a counter another process just started only orphans its
+        # entries, and a nanosecond start keeps old entries from matching.
+        started = dict.fromkeys(unversioned, clock.time_ns())
+        cache.set_many(started, timeout=settings.SLOT_INDEX_TIMEOUT)
+        found.update(started)
+    versions = {pair: found[key] for key, pair in version_keys.items()}
+    valid = {}
+    for pair, version in versions.items():
+        entry = found.get(_key(*pair))
+        if entry is not None and entry[0] == version:
+            valid[pair] = entry[1]
+    return versions, valid
+
+
+def _store(cache, versions, maps):
+    cache.set_many({_key(*pair): (versions[pair], bits) for pair, bits in maps.items()},
+                   timeout=settings.SLOT_INDEX_TIMEOUT)
+
+
+def _day_start(day, tz):
+    # UTC, so subtracting gives elapsed time rather than wall-clock difference
+    return day_range(day, tz)[0].astimezone(dt_timezone.utc)
+
+
+def _offset(day_start, moment):
+    return moment.astimezone(dt_timezone.utc) - day_start
+
+
+def _range_mask(lo, hi):
+    """Bits ``lo`` (inclusive) to ``hi`` (exclusive)."""
+    if hi <= lo:
+        return 0
+    return ((1 << hi) - 1) ^ ((1 << max(lo, 0)) - 1)
+
+
+def _positions(day, tz, start, end):
+    """Bucket positions whose start lies in local ``[start, end)`` on ``day``."""
+    day_start = _day_start(day, tz)
+    lo = -(-_offset(day_start, local_datetime(day, start, tz)) // STEP)
+    if end is None:
+        hi_at = day_range(day, tz)[1]
+    else:
+        hi_at = local_datetime(day, end, tz)
+    hi = -(-_offset(day_start, hi_at) // STEP)
+    return lo, hi
+
+
+def load(providers, days):
+    """Bitmaps for every ``(provider.id, day)`` pair, computed from the database."""
+    tzs = {p.id: user_timezone(p) for p in providers}
+    wanted = {(pid, day): 0 for pid in tzs for day in days}
+    if not wanted:
+        return wanted
+    since = any_zone_day_range(min(days))[0]
+    until = any_zone_day_range(max(days))[1]
+    starts = {}
+    rows = (
+        Slot.objects.using(DEFAULT_DB_ALIAS)
+        .filter(provider_id__in=list(tzs), is_booked=False, start_time__gte=since, start_time__lt=until)
+        .values_list('provider_id', 'start_time')
+    )
+    for provider_id, start in rows.iterator(chunk_size=5000):
+        tz = tzs[provider_id]
+        day = start.astimezone(tz).date()
+        if (provider_id, day) not in wanted:
+            continue
+        day_start = starts.get((tz, day))
+        if day_start is None:
+            day_start = starts[(tz, day)] = _day_start(day, tz)
+        wanted[(provider_id, day)] |= 1 << (_offset(day_start, start) // STEP)
+    return wanted
+
+
+def bitmaps(providers, days):
+    """Cached bitmaps for ``providers`` x ``days``, building the missing ones."""
+    cache = _cache()
+    pairs = [(p.id, day) for p in providers for day in days]
+    versions, result = _current(cache, pairs)
+    missing = {pair for pair in pairs if pair not in result}
+    if missing:
+        by_id = {p.id: p for p in providers}
+        built = load(
+            [by_id[pid] for pid in {pid for pid, _ in missing}],
+            sorted({day for _, day in missing}),
+        )
+        fresh = {pair: bits for pair, bits in built.items() if pair in missing}
+        _store(cache, versions, fresh)
+        result.update(fresh)
+    return result
+
+
+# --- queries ---------------------------------------------------------------
+
+def _window_masks(providers, day, start, end):
+    masks = {}
+    for p in providers:
+        tz = user_timezone(p)
+        if tz not in masks:
+            masks[tz] = _range_mask(*_positions(day, tz, start, end))
+    return masks
+
+
+def providers_with_free_slot(providers, day, start=time.min, end=None):
+    """Ids of ``providers`` with a free slot starting in local ``[start, end)`` on ``day``.
+
+    ``end=None`` means the end of the day. Uses the bitmaps when the index is
+    enabled, otherwise one ORM query.
+    """
+    providers = list(providers)
+    if not enabled():
+        return orm_providers_with_free_slot(providers, day, start, end)
+    masks = _window_masks(providers, day, start, end)
+    maps = bitmaps(providers, [day])
+    return [p.id for p in providers if maps[(p.id, day)] & masks[user_timezone(p)]]
+
+
+def orm_providers_with_free_slot(providers, day, start=time.min, end=None):
+    by_zone = defaultdict(list)
+    for p in providers:
+        by_zone[user_timezone(p)].append(p.id)
+    if not by_zone:
+        return []
+    condition = Q()
+    for tz, ids in by_zone.items():
+        since = local_datetime(day, start, tz)
+        until = day_range(day, tz)[1] if end is None else local_datetime(day, end, tz)
+        condition |= Q(provider_id__in=ids, start_time__gte=since, start_time__lt=until)
+    qs = Slot.objects.filter(condition, is_booked=False)
+    return sorted(set(qs.values_list('provider_id', flat=True)))
+
+
+SCAN_CHUNK_DAYS = 7
+
+
+def _day_chunks(first_day, days):
+    for offset in range(0, days, SCAN_CHUNK_DAYS):
+        yield [first_day + timedelta(days=i) for i in range(offset, min(offset + SCAN_CHUNK_DAYS, days))]
+
+
+def first_free_starts(providers, moment, days=30):
+    """Earliest free bucket start per provider id, from the bitmaps alone.
+
+    Works on the ``STEP_MINUTES`` grid: ``moment`` is rounded up to the next
+    bucket boundary and an off-grid slot is reported at its bucket's start.
+    Providers without a free slot in ``days`` local days are left out.
+    """
+    found = {}
+    by_zone = defaultdict(list)
+    for p in providers:
+        by_zone[user_timezone(p)].append(p)
+    for tz, pending in by_zone.items():
+        first_day = moment.astimezone(tz).date()
+        for span in _day_chunks(first_day, days):
+            maps = bitmaps(pending, span)
+            starts = {day: _day_start(day, tz) for day in span}
+            skip = -(-_offset(starts[first_day], moment) // STEP) if first_day in starts else 0
+            left = []
+            for p in pending:
+                for day in span:
+                    bits = maps[(p.id, day)]
+                    if day == first_day:
+                        bits &= ~((1 << skip) - 1)
+                    if bits:
+                        found[p.id] = starts[day] + STEP * ((bits & -bits).bit_length() - 1)
+                        break
+                else:
+                    left.append(p)
+            pending = left
+            if not pending:
+                break
+    return found
+
+
+def orm_first_free_starts(providers, moment, days=30):
+    by_zone = defaultdict(list)
+    for p in providers:
+        by_zone[user_timezone(p)].append(p.id)
+    if not by_zone:
+        return {}
+    condition = Q()
+    for tz, ids in by_zone.items():
+        until = day_range(moment.astimezone(tz).date() + timedelta(days=days), tz)[0]
+        condition |= Q(provider_id__in=ids, start_time__lt=until)
+    qs = (
+        Slot.objects.filter(condition, is_booked=False, start_time__gte=moment)
+        .values('provider_id').order_by().annotate(first=Min('start_time'))
+    )
+    return {row['provider_id']: row['first'] for row in qs}
+
+
+def first_free_after(provider, moment, days=30):
+    """The earliest free slot of ``provider`` starting at or after ``moment``."""
+    tz = user_timezone(provider)
+    first_day = moment.astimezone(tz).date()
+    for span in _day_chunks(first_day, days):
+        maps = bitmaps([provider], span)
+        for day in span:
+            bits = maps[(provider.id, day)]
+            day_start = _day_start(day, tz)
+            if day == first_day:
+                # keep the bucket holding ``moment``: a slot may start later in it
+                bits &= ~((1 << (_offset(day_start, moment) // STEP)) - 1)
+            while bits:
+                lowest = bits & -bits
+                bucket = day_start + STEP * (lowest.bit_length() - 1)
+                slot = (
+                    Slot.objects.filter(provider=provider, is_booked=False,
+                                        start_time__gte=max(bucket, moment), start_time__lt=bucket + STEP)
+                    .order_by('start_time').first()
+                )
+                if slot is not None:
+                    return slot
+                bits ^= lowest
+    return None
+
+
+def orm_first_free_after(provider, moment, days=30):
+    tz = user_timezone(provider)
+    until = day_range(moment.astimezone(tz).date() + timedelta(days=days), tz)[0]
+    return (
+        Slot.objects.filter(provider=provider, is_booked=False, start_time__gte=moment, start_time__lt=until)
+        .order_by('start_time').first()
+    )
+
+
+# --- maintenance -----------------------------------------------------------
+
+def _bump(provider_id, day):
+    try:
+        _cache().incr(_version_key(provider_id, day))
+    except ValueError:
+        # no counter, so no entry can be current
+        pass
+
+
+def _bump_on_commit(provider, moment):
+    day = moment.astimezone(user_timezone(provider)).date()
+    transaction.on_commit(lambda: _bump(provider.id, day))
+
+
+def slot_changed(slot):
+    """Mark the day of ``slot`` stale once the transaction commits (booked, freed or moved in)."""
+    if not enabled():
+        return
+    _bump_on_commit(slot.provider, slot.start_time)
+
+
+def slot_removed(provider, start_time):
+    """Mark the day of a deleted or moved slot stale once the transaction commits."""
+    if not enabled():
+        return
+    _bump_on_commit(provider, start_time)
+
+
+def invalidate_day(provider, day):
+    """Mark a provider-day stale so the next query rebuilds it (after bulk slot changes)."""
+    if not enabled():
+        return
+    transaction.on_commit(lambda: _bump(provider.id, day))
+
+
+def check(providers, days, repair=False):
+    """Compare cached provider-days with the database.
+
+    Returns ``(provider_id, day, cached, actual)`` for every cached entry that
+    differs; entries not in the cache or left stale by a later change are
+    skipped. ``repair`` overwrites the wrong ones.
+    """
+    cache = _cache()
+    versions, cached = _current(cache, [(p.id, day) for p in providers for day in days])
+    if not cached:
+        return []
+    actual = load([p for p in providers if any((p.id, day) in cached for day in days)], days)
+    wrong = [(pid, day, bits, actual[(pid, day)]) for (pid, day), bits in cached.items() if bits != actual[(pid, day)]]
+    if repair and wrong:
+        _store(cache, versions, {(pid, day): real for pid, day, _, real in wrong})
+    return wrong
+
+
+def bucket_times(provider, day, bits):
+    """Local start times of the set buckets, for reports."""
+    tz = user_timezone(provider)
+    day_start = _day_start(day, tz)
+    times = []
+    while bits:
+        lowest = bits & -bits
+        times.append((day_start + STEP * (lowest.bit_length() - 1)).astimezone(tz))
+        bits ^= lowest
+    return times
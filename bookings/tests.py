@@ -0,0 +1,177 @@
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+from .models import Availability, Slot, Appointment
+from .timeutils import day_range, zone_named
+
+NEW_YORK = 'America/New_York'
+SPRING_FORWARD = date(2026, 3, 8)
+FALL_BACK = date(2026, 11, 1)
+PLAIN_DAY = date(2026, 3, 9)
+
+
+class AdminChangelistQueryTests(TestCase):
+    """The slot and appointment changelists run a fixed number of queries.
+
+    Each list is rendered once and again after the tables (and the user
+    count) have grown, and must issue the same queries both times.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        cls.provider, cls.customer = cls._populate(5)
+
+    @classmethod
+    def _populate(cls, users):
+        tag = User.objects.count()
+        User.objects.bulk_create(
+            [User(username=f'provider-{tag}-{i}', role='provider') for i in range(users)]
+            + [User(username=f'customer-{tag}-{i}') for i in range(users)]
+        )
+        providers = list(User.objects.filter(username__startswith=f'provider-{tag}-'))
+        customers = list(User.objects.filter(username__startswith=f'customer-{tag}-'))
+        start = datetime(2026, 3, 2, 9, tzinfo=dt_timezone.utc) + timedelta(days=tag)
+        slots = Slot.objects.bulk_create([
+            Slot(provider=provider, start_time=start + timedelta(hours=i),
+                 end_time=start + timedelta(hours=i, minutes=30), is_booked=True)
+            for provider in providers for i in range(10)
+        ])
+        Appointment.objects.bulk_create([
+            Appointment(slot=slot, customer=customers[i % len(customers)]) for i, slot in enumerate(slots)
+        ])
+        return providers[0], customers[0]
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def assertConstantQueries(self, num, url, params=None):
+        with self.assertNumQueries(num):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self._populate(50)
+        with self.assertNumQueries(num):
+            self.client.get(url, params)
+
+    def test_slot_changelist(self):
+        self.assertConstantQueries(6, reverse('admin:bookings_slot_changelist'))
+
+    def test_slot_changelist_provider_filter(self):
+        self.assertConstantQueries(7, reverse('admin:bookings_slot_changelist'), {'provider': self.provider.id})
+
+    def test_slot_changelist_date_drilldown(self):
+        self.assertConstantQueries(
+            5, reverse('admin:bookings_slot_changelist'), {'start_time__year': 2026, 'start_time__month': 3})
+
+    def test_appointment_changelist(self):
+        self.assertConstantQueries(6, reverse('admin:bookings_appointment_changelist'))
+
+    def test_appointment_changelist_user_filters(self):
+        self.assertConstantQueries(
+            7, reverse('admin:bookings_appointment_changelist'), {'customer': self.customer.id})
+        self.assertConstantQueries(
+            8, reverse('admin:bookings_appointment_changelist'),
+            {'provider': self.provider.id, 'customer': self.customer.id})
+
+    def test_appointment_changelist_date_drilldown(self):
+        today = Appointment.objects.values_list('created_at', flat=True).first()
+        self.assertConstantQueries(
+            5, reverse('admin:bookings_appointment_changelist'),
+            {'created_at__year': today.year, 'created_at__month': today.month})
+
+    def test_malformed_user_filter(self):
+        for value in ('²', '9' * 20, 'abc'):
+            response = self.client.get(reverse('admin:bookings_slot_changelist'), {'provider': value})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(list(response.context['cl'].result_list), [])
+
+
+class DayRangeTests(SimpleTestCase):
+
+    def assertDayLength(self, day, hours):
+        start, end = day_range(day, zone_named(NEW_YORK))
+        # same-zone subtraction is wall-clock, so compare elapsed time in UTC
+        self.assertEqual(end.astimezone(dt_timezone.utc) - start.astimezone(dt_timezone.utc), timedelta(hours=hours))
+
+    def test_spring_forward_day_is_23_hours(self):
+        self.assertDayLength(SPRING_FORWARD, 23)
+
+    def test_fall_back_day_is_25_hours(self):
+        self.assertDayLength(FALL_BACK, 25)
+
+    def test_plain_day_is_24_hours(self):
+        self.assertDayLength(PLAIN_DAY, 24)
+
+
+class GenerateSlotsDstTests(TestCase):
+    """Slots step in elapsed time, so 00:00-06:00 local holds 5, 6 or 7 hours."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.provider = User.objects.create_user('dst-provider', role='provider', timezone=NEW_YORK)
+
+    def generate(self, day):
+        availability = Availability.objects.create(
+            provider=self.provider, date=day, start_time=time(0), end_time=time(6), interval_minutes=60)
+        created = availability.generate_slots()
+        starts = list(Slot.objects.filter(provider=self.provider, start_time__range=day_range(
+            day, zone_named(NEW_YORK))).values_list('start_time', flat=True))
+        self.assertEqual(len(starts), created)
+        self.assertTrue(all(b - a == timedelta(hours=1) for a, b in zip(starts, starts[1:])))
+        return created
+
+    def test_spring_forward(self):
+        self.assertEqual(self.generate(SPRING_FORWARD), 5)
+
+    def test_fall_back(self):
+        self.assertEqual(self.generate(FALL_BACK), 7)
+
+    def test_plain_day(self):
+        self.assertEqual(self.generate(PLAIN_DAY), 6)
+
+
+@override_settings(RATE_LIMITS={'booking': (2, 60)})
+class BookingThrottleTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.provider = User.objects.create_user('throttle-provider', role='provider')
+        cls.customer = User.objects.create_user('throttle-customer')
+        start = datetime(2030, 1, 7, 9, tzinfo=dt_timezone.utc)
+        cls.slots = Slot.objects.bulk_create([
+            Slot(provider=cls.provider, start_time=start + timedelta(hours=i),
+                 end_time=start + timedelta(hours=i, minutes=30))
+            for i in range(4)
+        ])
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.customer)
+
+    def book(self, slot, key):
+        return self.client.post(reverse('book_slot', args=[slot.id]), {'idempotency_key': key})
+
+    def test_empty_bucket_answers_429_with_retry_after(self):
+        self.assertEqual(self.book(self.slots[0], 'a').status_code, 302)
+        self.assertEqual(self.book(self.slots[1], 'b').status_code, 302)
+        response = self.book(self.slots[2], 'c')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        self.assertFalse(Appointment.objects.filter(slot=self.slots[2]).exists())
+
+    def test_replay_does_not_book_twice(self):
+        first = self.book(self.slots[0], 'same')
+        second = self.book(self.slots[0], 'same')
+        self.assertEqual(second.status_code, first.status_code)
+        self.assertEqual(second['Location'], first['Location'])
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(Appointment.objects.filter(slot=self.slots[0]).count(), 1)
+
+    def test_replays_do_not_spend_tokens(self):
+        for _ in range(3):
+            self.book(self.slots[0], 'same')
+        self.assertEqual(self.book(self.slots[1], 'other').status_code, 302)
@@ -0,0 +1,132 @@
+"""Cheap guards for the booking POST endpoints.
+
+``rate_limit`` is a token bucket kept in the Django cache, one bucket per
+user and one per client IP; a request must get a token from both. Buckets
+are read and written with a single ``get_many``/``set_many`` pair, so an
+over-limit request is rejected with 429 before the view touches the
+database. The read-modify-write is not atomic, so concurrent requests can
+overshoot a bucket by a token or two, which is fine for abuse control.
+
+``idempotent`` replays the stored response when a booking POST is repeated
+with the same idempotency key (``Idempotency-Key`` header or the hidden
+``idempotency_key`` form field), on the same URL including its query string.
+A duplicate that arrives while the first request is still running (a
+double-click) waits up to ``IDEMPOTENCY_WAIT_SECONDS`` and then replays the
+first response, so the browser lands where the first click would have; only
+if the first request takes longer than that does it get a 409.
+
+Both decorators only act on unsafe methods, so they can wrap views that
+also render a GET page. Put ``idempotent`` outside ``rate_limit``: replays
+are then served from the cache without spending a token, and a 429 is not
+stored, so the same key can be retried once the bucket refills.
+"""
+import hashlib
+import time
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+IDEMPOTENCY_TTL = 60 * 60 * 24
+IDEMPOTENCY_PENDING = 'pending'
+IDEMPOTENCY_POLL_SECONDS = 0.05
+
+
+def new_idempotency_key():
+    return uuid.uuid4().hex
+
+
+def client_ip(request):
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _take_tokens(keys, capacity, per_seconds):
+    """Take one token from every bucket in ``keys``; return seconds to wait or 0."""
+    now = time.time()
+    refill = capacity / per_seconds
+    buckets = cache.get_many(keys)
+    updated = {}
+    wait = 0
+    for key in keys:
+        tokens, stamp = buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - stamp) * refill)
+        if tokens < 1:
+            wait = max(wait, (1 - tokens) / refill)
+        updated[key] = (tokens - 1, now)
+    if wait:
+        return wait
+    cache.set_many(updated, timeout=int(per_seconds) + 1)
+    return 0
+
+
+def rate_limit(scope):
+    """Throttle unsafe requests using ``settings.RATE_LIMITS[scope] = (burst, per_seconds)``."""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method in SAFE_METHODS or scope not in settings.RATE_LIMITS:
+                return view_func(request, *args, **kwargs)
+            capacity, per_seconds = settings.RATE_LIMITS[scope]
+            keys = [f'ratelimit:{scope}:ip:{client_ip(request)}']
+            if request.user.is_authenticated:
+                keys.append(f'ratelimit:{scope}:user:{request.user.pk}')
+            wait = _take_tokens(keys, capacity, per_seconds)
+            if wait:
+                response = HttpResponse('Too many booking attempts, please wait a moment.', status=429, content_type='text/plain')
+                response['Retry-After'] = str(int(wait) + 1)
+                return response
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _replay(stored):
+    status, headers, content = stored
+    response = HttpResponse(content, status=status)
+    for name, value in headers.items():
+        response[name] = value
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view_func):
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get('Idempotency-Key') or request.POST.get('idempotency_key')
+        if request.method in SAFE_METHODS or not key:
+            return view_func(request, *args, **kwargs)
+        user_part = request.user.pk if request.user.is_authenticated else client_ip(request)
+        # the wizard confirms through ?slot=, so the query string is part of the request
+        path = hashlib.sha256(request.get_full_path().encode()).hexdigest()[:32]
+        cache_key = f'idempotency:{user_part}:{path}:{key[:64]}'
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+        while not cache.add(cache_key, IDEMPOTENCY_PENDING, timeout=settings.IDEMPOTENCY_LOCK_SECONDS):
+            stored = cache.get(cache_key)
+            if stored is not None and stored != IDEMPOTENCY_PENDING:
+                return _replay(stored)
+            if time.monotonic() >= deadline:
+                response = HttpResponse('This request is already being processed.', status=409, content_type='text/plain')
+                response['Retry-After'] = '1'
+                return response
+            # still running, or it failed and released the key: look again
+            time.sleep(IDEMPOTENCY_POLL_SECONDS)
+        try:
+            response = view_func(request, *args, **kwargs)
+        except Exception:
+            cache.delete(cache_key)
+            raise
+        # throttled or failed attempts may be retried with the same key
+        if response.status_code == 429 or response.status_code >= 500 or response.streaming:
+            cache.delete(cache_key)
+        else:
+            headers = {name: response[name] for name in ('Location', 'Content-Type') if response.has_header(name)}
+            cache.set(cache_key, (response.status_code, headers, response.content), timeout=IDEMPOTENCY_TTL)
+        return response
+    return wrapper
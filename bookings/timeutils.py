@@ -0,0 +1,81 @@
+"""Provider-timezone aware date helpers.
+
+Slots are stored as aware UTC datetimes. A "day" only means something in the
+provider's own zone, so every per-day filter converts the local day into a
+half-open ``[start, end)`` UTC range. Filtering ``start_time__gte/__lt`` on
+that range is a plain range scan on the ``(provider, start_time)`` index,
+unlike ``start_time__date=`` which wraps the column in a function. Days that
+cross a DST change come out 23 or 25 hours long, as they should.
+"""
+import zoneinfo
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
+from django.utils import timezone
+
+
+def zone_named(name):
+    try:
+        return zoneinfo.ZoneInfo(name)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError, TypeError):
+        return timezone.get_default_timezone()
+
+
+def user_timezone(user):
+    return zone_named(getattr(user, 'timezone', None))
+
+
+def parse_day(value):
+    """``YYYY-MM-DD`` -> ``date``; ``None`` for missing or malformed input."""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def local_datetime(day, at, tz):
+    return datetime.combine(day, at, tzinfo=tz)
+
+
+def day_range(day, tz):
+    """Aware ``(start, end)`` covering ``day`` in ``tz``, end exclusive."""
+    start = local_datetime(day, time.min, tz)
+    end = local_datetime(day + timedelta(days=1), time.min, tz)
+    return start, end
+
+
+def any_zone_day_range(day):
+    """UTC range containing ``day`` in every zone (offsets run from -12h to +14h).
+
+    Lets a query start before the provider's zone is known; narrow the rows
+    with ``provider_day_range`` afterwards.
+    """
+    start = datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+    return start - timedelta(hours=14), start + timedelta(days=1, hours=12)
+
+
+def provider_day_range(provider, day):
+    return day_range(day, user_timezone(provider))
+
+
+def any_zone_day_filter(day):
+    """``filter()`` kwargs for slots that may start on ``day`` in any zone.
+
+    For queries that run before (or alongside) the provider lookup; drop the
+    extra rows with ``on_provider_day`` once the provider is known.
+    """
+    return {'start_time__range': any_zone_day_range(day)}
+
+
+def on_provider_day(slots, provider, day):
+    """The ``slots`` starting on ``day`` in the provider's zone."""
+    start, end = provider_day_range(provider, day)
+    return [s for s in slots if start <= s.start_time < end]
+
+
+def make_provider_aware(provider, value):
+    """Interpret naive form input in the provider's zone; aware values pass through."""
+    if timezone.is_aware(value):
+        return value
+    return value.replace(tzinfo=user_timezone(provider))
@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import views, feeds
 
 urlpatterns = [
     path('slots/', views.slot_list, name='slot_list'),
@@ -13,10 +13,15 @@ urlpatterns = [
     path('reject/<int:appointment_id>/', views.appointment_action, {'action':'reject'}, name='appointment_reject'),
     path('book/<int:slot_id>/', views.book_slot, name='book_slot'),
     path('api/providers/<int:provider_id>/slots/', views.api_available_slots, name='api_available_slots'),
+    path('api/providers/<int:provider_id>/recommendations/', views.api_recommended_slots, name='api_recommended_slots'),
     path('book/', views.booking_wizard, name='booking_wizard'),
     path('confirmation/<int:appointment_id>/', views.booking_confirmation, name='booking_confirmation'),
     path('availability/', views.availability_list, name='availability_list'),
     path('availability/create/', views.availability_create, name='availability_create'),
     path('availability/<int:availability_id>/edit/', views.availability_edit, name='availability_edit'),
     path('availability/<int:availability_id>/delete/', views.availability_delete, name='availability_delete'),
+    path('feeds/<str:token>/appointments.ics', feeds.appointments_feed, name='feed_appointments'),
+    path('feeds/<str:token>/slots.ics', feeds.slots_feed, name='feed_slots'),
+    path('feeds/<str:token>/changes/', feeds.feed_changes, name='feed_changes'),
+    path('feeds/reset/', feeds.reset_feed, name='feed_reset'),
 ]
@@ -1,18 +1,30 @@
+import asyncio
+from functools import wraps
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.auth.views import redirect_to_login
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from .models import Slot, Appointment, Availability
 from accounts.models import User
 from django.views.decorators.http import require_POST
 from django.core.mail import send_mail
+from django.db import transaction
+from analytics.rollups import record_transition
+from config.replicas import replica_reads
+from . import slot_index
+from .recommendations import record_preference, recommend_slots
+from .throttling import rate_limit, idempotent, new_idempotency_key
+from .timeutils import parse_day, any_zone_day_filter, on_provider_day, provider_day_range, local_datetime, make_provider_aware, user_timezone
 
 @login_required
 def slot_list(request):
     if not request.user.is_provider():
         return redirect('dashboard')
     slots = Slot.objects.filter(provider=request.user)
-    return render(request, 'bookings/slot_list.html', {'slots': slots})
+    return render(request, 'bookings/slot_list.html', {'slots': slots, 'provider_tz': user_timezone(request.user)})
 
 @login_required
 def slot_create(request):
@@ -25,10 +37,11 @@ def slot_create(request):
         if start and end:
             from datetime import datetime
             try:
-                start_dt = datetime.fromisoformat(start)
-                end_dt = datetime.fromisoformat(end)
+                start_dt = make_provider_aware(request.user, datetime.fromisoformat(start))
+                end_dt = make_provider_aware(request.user, datetime.fromisoformat(end))
                 if end_dt > start_dt:
-                    Slot.objects.create(provider=request.user, start_time=start_dt, end_time=end_dt)
+                    slot = Slot.objects.create(provider=request.user, start_time=start_dt, end_time=end_dt)
+                    slot_index.slot_changed(slot)
                     return redirect('slot_list')
                 else:
                     message = 'End must be after start'
@@ -40,6 +53,7 @@ def slot_create(request):
 def slot_delete(request, slot_id):
     slot = get_object_or_404(Slot, id=slot_id, provider=request.user, is_booked=False)
     slot.delete()
+    slot_index.slot_removed(request.user, slot.start_time)
     return redirect('slot_list')
 
 @login_required
@@ -51,44 +65,85 @@ def slot_edit(request, slot_id):
         end = request.POST.get('end')
         from datetime import datetime
         try:
-            start_dt = datetime.fromisoformat(start)
-            end_dt = datetime.fromisoformat(end)
+            start_dt = make_provider_aware(request.user, datetime.fromisoformat(start))
+            end_dt = make_provider_aware(request.user, datetime.fromisoformat(end))
             if end_dt > start_dt:
+                slot_index.slot_removed(request.user, slot.start_time)
                 slot.start_time = start_dt
                 slot.end_time = end_dt
                 slot.save()
+                slot_index.slot_changed(slot)
                 return redirect('slot_list')
             else:
                 message = 'End must be after start'
         except ValueError:
             message = 'Invalid date format'
-    return render(request, 'bookings/slot_edit.html', {'slot': slot, 'message': message})
+    # the form shows and parses provider-local wall time
+    return render(request, 'bookings/slot_edit.html', {
+        'slot': slot,
+        'message': message,
+        'provider_tz': user_timezone(request.user),
+    })
 
 @login_required
+@replica_reads
 def appointment_list(request):
     mode = request.GET.get('mode')
     if request.user.is_provider() and mode == 'provider':
         appointments = Appointment.objects.filter(slot__provider=request.user)
     else:
         appointments = Appointment.objects.filter(customer=request.user)
+    appointments = appointments.select_related('slot__provider', 'customer')
     return render(request, 'bookings/appointment_list.html', {
         'appointments': appointments,
         'mode': mode,
         'now': timezone.now(),
     })
 
+def async_login_required(view_func):
+    """``login_required`` for async views (Django 5.0's decorator is sync-only)."""
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        # resolved user, so templates and context processors never hit the DB lazily
+        request.user = user
+        return await view_func(request, *args, **kwargs)
+    return wrapper
+
+async def _alist(qs):
+    return [obj async for obj in qs]
+
+async def _none():
+    return None
+
+def _claim_slot(slot):
+    """Flip a free slot to booked in one UPDATE; False if another request got it first."""
+    claimed = Slot.objects.filter(id=slot.id, is_booked=False).update(is_booked=True, updated_at=timezone.now())
+    slot.is_booked = bool(claimed)
+    if claimed:
+        slot_index.slot_changed(slot)
+    return bool(claimed)
+
 @login_required
 @require_POST
+@idempotent
+@rate_limit('booking')
 def book_slot(request, slot_id):
-    slot = get_object_or_404(Slot, id=slot_id, is_booked=False)
+    slot = get_object_or_404(Slot.objects.select_related('provider'), id=slot_id, is_booked=False)
     if request.user.is_provider():
         return redirect('providers_list')
-    appt = Appointment.objects.create(slot=slot, customer=request.user)
-    slot.is_booked = True
-    slot.save()
+    with transaction.atomic():
+        if not _claim_slot(slot):
+            return redirect('provider_slots', slot.provider_id)
+        appt = Appointment.objects.create(slot=slot, customer=request.user)
+        record_transition(appt, 'pending')
+        record_preference(appt, 'pending')
+    when = f'{slot.start_time.astimezone(slot.provider_tz):%Y-%m-%d %H:%M %Z}'
     send_mail(
         'Appointment Request Submitted',
-        f'Your appointment request with {slot.provider.username} at {slot.start_time} was submitted.',
+        f'Your appointment request with {slot.provider.username} at {when} was submitted.',
         None,
         [request.user.email or 'test@example.com'],
         fail_silently=True,
@@ -96,23 +151,34 @@ def book_slot(request, slot_id):
     if slot.provider.email:
         send_mail(
             'New Appointment Request',
-            f'{request.user.username} requested {slot.start_time}.',
+            f'{request.user.username} requested {when}.',
             None,
             [slot.provider.email],
             fail_silently=True,
         )
     return redirect('appointment_list')
 
-@login_required
-def provider_slots(request, provider_id):
-    provider = get_object_or_404(User, id=provider_id, role='provider')
-    # show only free slots
-    slots = Slot.objects.filter(provider=provider, is_booked=False).order_by('start_time')
-    return render(request, 'bookings/provider_slots.html', {'provider': provider, 'slots': slots})
+@async_login_required
+@replica_reads
+async def provider_slots(request, provider_id):
+    # the provider lookup and the free-slot query do not depend on each other
+    provider, slots = await asyncio.gather(
+        User.objects.filter(id=provider_id, role='provider').afirst(),
+        _alist(Slot.objects.filter(provider_id=provider_id, is_booked=False).order_by('start_time')),
+    )
+    if provider is None:
+        raise Http404('No provider matches the given query.')
+    return render(request, 'bookings/provider_slots.html', {
+        'provider': provider,
+        'slots': slots,
+        'provider_tz': user_timezone(provider),
+        'idempotency_key': new_idempotency_key(),
+    })
 
 @login_required
 def appointment_action(request, appointment_id, action):
-    appt = get_object_or_404(Appointment, id=appointment_id)
+    appt = get_object_or_404(Appointment.objects.select_related('slot__provider', 'customer'), id=appointment_id)
+    when = f'{appt.slot.start_time.astimezone(appt.slot.provider_tz):%Y-%m-%d %H:%M %Z}'
 
     def notify(subject, body, both=True):
         if appt.customer.email:
@@ -125,8 +191,11 @@ def appointment_action(request, appointment_id, action):
         appt.status = 'cancelled'
         appt.slot.is_booked = False
         appt.slot.save()
+        slot_index.slot_changed(appt.slot)
         appt.save()
-        notify('Appointment Cancelled', f'Appointment on {appt.slot.start_time} cancelled by customer.')
+        record_transition(appt, appt.status)
+        record_preference(appt, appt.status)
+        notify('Appointment Cancelled', f'Appointment on {when} cancelled by customer.')
         return redirect('appointment_list')
 
     if request.user.is_provider() and appt.slot.provider == request.user:
@@ -138,44 +207,55 @@ def appointment_action(request, appointment_id, action):
                 appt.status = 'rejected'
                 appt.slot.is_booked = False
                 appt.slot.save()
+                slot_index.slot_changed(appt.slot)
             appt.save()
-            notify('Appointment Status Updated', f'Appointment on {appt.slot.start_time} is now {appt.status}.')
+            record_transition(appt, appt.status)
+            record_preference(appt, appt.status)
+            notify('Appointment Status Updated', f'Appointment on {when} is now {appt.status}.')
             return redirect('appointment_list')
-        # Complete after passed time
+        # Complete / no-show after passed time
         if appt.status == 'approved' and action == 'complete' and appt.slot.start_time < timezone.now():
             appt.status = 'completed'
             appt.save()
-            notify('Appointment Completed', f'Appointment on {appt.slot.start_time} marked completed.')
+            record_transition(appt, appt.status)
+            record_preference(appt, appt.status)
+            notify('Appointment Completed', f'Appointment on {when} marked completed.')
+            return redirect('appointment_list')
+        if appt.status == 'approved' and action == 'no_show' and appt.slot.start_time < timezone.now():
+            appt.status = 'no_show'
+            appt.save()
+            record_transition(appt, appt.status)
+            record_preference(appt, appt.status)
+            notify('Appointment Missed', f'Appointment on {when} was marked as a no-show.')
             return redirect('appointment_list')
 
     return redirect('appointment_list')
 
-@login_required
-def api_available_slots(request, provider_id):
-    provider = get_object_or_404(User, id=provider_id, role='provider')
-    date_filter = request.GET.get('date')
-    qs = Slot.objects.filter(provider=provider, is_booked=False)
-    
-    if date_filter:
-        from datetime import datetime, timedelta
-        try:
-            y, m, d = map(int, date_filter.split('-'))
-            start_day = datetime(y, m, d)
-            end_day = start_day + timedelta(days=1)
-            qs = qs.filter(start_time__gte=start_day, start_time__lt=end_day)
-        except ValueError:
-            pass
-    
-    qs = qs.order_by('start_time')
+@async_login_required
+@replica_reads
+async def api_available_slots(request, provider_id):
+    day = parse_day(request.GET.get('date'))
+    qs = Slot.objects.filter(provider_id=provider_id, is_booked=False)
+    if day:
+        qs = qs.filter(**any_zone_day_filter(day))
+    provider, slots = await asyncio.gather(
+        User.objects.filter(id=provider_id, role='provider').afirst(),
+        _alist(qs.order_by('start_time')),
+    )
+    if provider is None:
+        raise Http404('No provider matches the given query.')
+    if day:
+        slots = on_provider_day(slots, provider, day)
+    tz = user_timezone(provider)
     
     data = [{
         'id': s.id,
         'start': s.start_time.isoformat(),
         'end': s.end_time.isoformat(),
         'duration': int((s.end_time - s.start_time).total_seconds() / 60),
-        'formatted_time': s.start_time.strftime('%I:%M %p'),
-        'formatted_date': s.start_time.strftime('%B %d, %Y'),
-    } for s in qs]
+        'formatted_time': s.start_time.astimezone(tz).strftime('%I:%M %p'),
+        'formatted_date': s.start_time.astimezone(tz).strftime('%B %d, %Y'),
+    } for s in slots]
     
     return JsonResponse({
         'slots': data,
@@ -187,75 +267,105 @@ def api_available_slots(request, provider_id):
     })
 
 @login_required
-def booking_wizard(request):
-    # Step params via query: provider, date, slot
-    provider_id = request.GET.get('provider')
-    date = request.GET.get('date')
-    slot_id = request.GET.get('slot')
-    providers = User.objects.filter(role='provider')
-    selected_provider = None
-    available_slots = []
+@replica_reads
+def api_recommended_slots(request, provider_id):
+    provider = get_object_or_404(User, id=provider_id, role='provider')
+    try:
+        k = max(1, min(int(request.GET.get('k', 5)), 50))
+    except ValueError:
+        k = 5
+    tz = user_timezone(request.user)
+    data = [{
+        'id': slot_id,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'score': round(score, 4),
+        'formatted_time': start.astimezone(tz).strftime('%I:%M %p'),
+        'formatted_date': start.astimezone(tz).strftime('%B %d, %Y'),
+    } for score, slot_id, start, end in recommend_slots(request.user, provider, k=k)]
+    return JsonResponse({'slots': data, 'count': len(data)})
+
+@idempotent
+@rate_limit('booking')
+def _confirm_booking(request, slot_id):
+    # final confirmation with enhanced data
+    slot = get_object_or_404(Slot.objects.select_related('provider'), id=slot_id, is_booked=False)
+    if request.user.is_provider():
+        return redirect('booking_wizard')
     
-    if provider_id:
-        selected_provider = User.objects.filter(id=provider_id, role='provider').first()
-        if selected_provider:
-            qs = Slot.objects.filter(provider=selected_provider, is_booked=False)
-            if date:
-                from datetime import datetime, timedelta
-                try:
-                    y,m,d = map(int, date.split('-'))
-                    start_day = datetime(y,m,d)
-                    end_day = start_day + timedelta(days=1)
-                    qs = qs.filter(start_time__gte=start_day, start_time__lt=end_day)
-                except ValueError:
-                    pass
-            available_slots = qs.order_by('start_time')
+    appointment_type = request.POST.get('appointment_type', 'consultation')
+    if appointment_type not in dict(Appointment.APPOINTMENT_TYPES):
+        appointment_type = 'consultation'
+    patient_notes = request.POST.get('patient_notes', '')
     
-    confirm_slot = None
-    if slot_id and request.method == 'POST':
-        # final confirmation with enhanced data
-        slot = get_object_or_404(Slot, id=slot_id, is_booked=False)
-        if request.user.is_provider():
-            return redirect('booking_wizard')
-        
-        appointment_type = request.POST.get('appointment_type', 'consultation')
-        patient_notes = request.POST.get('patient_notes', '')
-        
+    with transaction.atomic():
+        if not _claim_slot(slot):
+            return redirect(f"{reverse('booking_wizard')}?provider={slot.provider_id}")
         appt = Appointment.objects.create(
             slot=slot, 
             customer=request.user,
             appointment_type=appointment_type,
             patient_notes=patient_notes
         )
-        slot.is_booked = True
-        slot.save()
-        
-        # Enhanced email notifications
-        if request.user.email:
-            send_mail(
-                f'Appointment Request Submitted - {appointment_type.title()}',
-                f'Your {appointment_type} appointment request for {slot.start_time.strftime("%B %d, %Y at %I:%M %p")} with Dr. {slot.provider.first_name or slot.provider.username} has been submitted successfully.\n\nAppointment Details:\n- Type: {appointment_type.title()}\n- Date & Time: {slot.start_time.strftime("%B %d, %Y at %I:%M %p")}\n- Duration: 30 minutes\n- Status: Pending approval\n\nYou will receive a confirmation email once your appointment is approved by the provider.',
-                None,
-                [request.user.email],
-                fail_silently=True,
-            )
-        
-        if slot.provider.email:
-            send_mail(
-                f'New Appointment Request - {appointment_type.title()}',
-                f'You have received a new {appointment_type} appointment request.\n\nPatient: {request.user.first_name} {request.user.last_name} ({request.user.username})\nDate & Time: {slot.start_time.strftime("%B %d, %Y at %I:%M %p")}\nType: {appointment_type.title()}\nPatient Notes: {patient_notes or "None provided"}\n\nPlease log into your dashboard to approve or reject this request.',
-                None,
-                [slot.provider.email],
-                fail_silently=True,
-            )
-        
-        return redirect('booking_confirmation', appt.id)
-    elif slot_id:
-        confirm_slot = Slot.objects.filter(id=slot_id, is_booked=False).first()
+        record_transition(appt, 'pending')
+        record_preference(appt, 'pending')
+    when = slot.start_time.astimezone(slot.provider_tz).strftime("%B %d, %Y at %I:%M %p %Z")
+    
+    # Enhanced email notifications
+    if request.user.email:
+        send_mail(
+            f'Appointment Request Submitted - {appointment_type.title()}',
+            f'Your {appointment_type} appointment request for {when} with Dr. {slot.provider.first_name or slot.provider.username} has been submitted successfully.\n\nAppointment Details:\n- Type: {appointment_type.title()}\n- Date & Time: {when}\n- Duration: 30 minutes\n- Status: Pending approval\n\nYou will receive a confirmation email once your appointment is approved by the provider.',
+            None,
+            [request.user.email],
+            fail_silently=True,
+        )
+    
+    if slot.provider.email:
+        send_mail(
+            f'New Appointment Request - {appointment_type.title()}',
+            f'You have received a new {appointment_type} appointment request.\n\nPatient: {request.user.first_name} {request.user.last_name} ({request.user.username})\nDate & Time: {when}\nType: {appointment_type.title()}\nPatient Notes: {patient_notes or "None provided"}\n\nPlease log into your dashboard to approve or reject this request.',
+            None,
+            [slot.provider.email],
+            fail_silently=True,
+        )
+    
+    return redirect('booking_confirmation', appt.id)
+
+@async_login_required
+async def booking_wizard(request):
+    # Step params via query: provider, date, slot
+    provider_id = request.GET.get('provider')
+    date = request.GET.get('date')
+    slot_id = request.GET.get('slot')
+    if slot_id and request.method == 'POST':
+        return await sync_to_async(_confirm_booking)(request, slot_id)
+
+    day = parse_day(date)
+    slots_qs = Slot.objects.none()
+    if provider_id:
+        slots_qs = Slot.objects.filter(provider_id=provider_id, is_booked=False).order_by('start_time')
+        if day:
+            slots_qs = slots_qs.filter(**any_zone_day_filter(day))
+    selected_provider_q = User.objects.filter(id=provider_id, role='provider').afirst() if provider_id else _none()
+    confirm_slot_q = (Slot.objects.select_related('provider').filter(id=slot_id, is_booked=False).afirst()
+                      if slot_id else _none())
+    providers, selected_provider, available_slots, confirm_slot = await asyncio.gather(
+        _alist(User.objects.filter(role='provider')),
+        selected_provider_q,
+        _alist(slots_qs),
+        confirm_slot_q,
+    )
+    if selected_provider is None:
+        available_slots = []
+    elif day:
+        available_slots = on_provider_day(available_slots, selected_provider, day)
     
     # Add context for today and max date
-    from datetime import datetime, timedelta
-    today = datetime.now().date()
+    from datetime import timedelta
+    shown_provider = selected_provider or (confirm_slot.provider if confirm_slot else None)
+    provider_tz = user_timezone(shown_provider) if shown_provider else None
+    today = timezone.localdate(timezone=provider_tz)
     max_date = today + timedelta(days=30)
     
     return render(request, 'bookings/book.html', {
@@ -267,11 +377,13 @@ def booking_wizard(request):
         'today': today,
         'max_date': max_date,
         'appointment_types': Appointment.APPOINTMENT_TYPES,
+        'provider_tz': provider_tz,
+        'idempotency_key': new_idempotency_key(),
     })
 
 @login_required
 def booking_confirmation(request, appointment_id):
-    appt = get_object_or_404(Appointment, id=appointment_id, customer=request.user)
+    appt = get_object_or_404(Appointment.objects.select_related('slot__provider'), id=appointment_id, customer=request.user)
     return render(request, 'bookings/confirmation.html', {'appointment': appt})
 
 @login_required
@@ -302,14 +414,16 @@ def availability_create(request):
             elif interval_val not in (10, 15, 20, 30, 45, 60):
                 message = 'Invalid interval.'
             else:
-                start_dt = dt.combine(date_obj, start_t)
-                end_dt = dt.combine(date_obj, end_t)
+                tz = user_timezone(request.user)
+                start_dt = local_datetime(date_obj, start_t, tz)
+                end_dt = local_datetime(date_obj, end_t, tz)
                 overlap_slots = Slot.objects.filter(provider=request.user, start_time__lt=end_dt, end_time__gt=start_dt)
                 if overlap_slots.exists():
                     message = 'Overlaps existing slots.'
                 else:
                     availability = Availability.objects.create(provider=request.user, date=date_obj, start_time=start_t, end_time=end_t, interval_minutes=interval_val)
                     availability.generate_slots()
+                    slot_index.invalidate_day(request.user, date_obj)
                     return redirect('availability_list')
         except ValueError:
             message = 'Invalid input.'
@@ -322,7 +436,8 @@ def availability_edit(request, availability_id):
     availability = get_object_or_404(Availability, id=availability_id, provider=request.user)
     message = None
     # if any generated slot for this availability is booked, restrict edits of times/interval
-    related_slots = Slot.objects.filter(provider=request.user, start_time__date=availability.date)
+    day_start, day_end = provider_day_range(request.user, availability.date)
+    related_slots = Slot.objects.filter(provider=request.user, start_time__gte=day_start, start_time__lt=day_end)
     has_booked = related_slots.filter(is_booked=True).exists()
     if request.method == 'POST':
         if has_booked:
@@ -343,14 +458,17 @@ def availability_edit(request, availability_id):
                 elif interval_val not in (10,15,20,30,45,60):
                     message = 'Invalid interval.'
                 else:
+                    old_date = availability.date
                     availability.date = date_obj
                     availability.start_time = start_t
                     availability.end_time = end_t
                     availability.interval_minutes = interval_val
                     availability.save()
                     # regenerate slots (delete old free slots only) when editing
-                    Slot.objects.filter(provider=request.user, start_time__date=availability.date, is_booked=False).delete()
+                    related_slots.filter(is_booked=False).delete()
                     availability.generate_slots()
+                    slot_index.invalidate_day(request.user, old_date)
+                    slot_index.invalidate_day(request.user, date_obj)
                     return redirect('availability_list')
             except ValueError:
                 message = 'Invalid input.'
@@ -366,13 +484,15 @@ def availability_delete(request, availability_id):
         return redirect('dashboard')
     availability = get_object_or_404(Availability, id=availability_id, provider=request.user)
     # Disallow delete if any slot for that window is booked
-    related_slots = Slot.objects.filter(provider=request.user, start_time__date=availability.date)
+    day_start, day_end = provider_day_range(request.user, availability.date)
+    related_slots = Slot.objects.filter(provider=request.user, start_time__gte=day_start, start_time__lt=day_end)
     if related_slots.filter(is_booked=True).exists():
         # redirect with flash? simple message page for now
         return render(request, 'bookings/availability_delete.html', {'availability': availability, 'blocked': True})
     if request.method == 'POST':
         # delete availability and its free slots for that date
-        Slot.objects.filter(provider=request.user, start_time__date=availability.date, is_booked=False).delete()
+        related_slots.filter(is_booked=False).delete()
         availability.delete()
+        slot_index.invalidate_day(request.user, availability.date)
         return redirect('availability_list')
     return render(request, 'bookings/availability_delete.html', {'availability': availability, 'blocked': False})
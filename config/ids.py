@@ -0,0 +1,15 @@
+"""Integer ids from query strings.
+
+``int()`` accepts values no database column can hold, and the driver then
+raises ``OverflowError`` mid-query; parse with ``parse_db_int`` instead.
+"""
+# primary keys and offsets are signed 64-bit in the database
+MAX_DB_INT = 2 ** 63 - 1
+
+
+def parse_db_int(raw):
+    """``int(raw)``, with values the database cannot bind raising ``ValueError``."""
+    value = int(raw)
+    if not -MAX_DB_INT - 1 <= value <= MAX_DB_INT:
+        raise ValueError(f'{raw} is out of range')
+    return value
@@ -0,0 +1,124 @@
+"""Read-replica routing.
+
+Views opt in to replica reads with ``@replica_reads``; everything else keeps
+reading from the primary. ``ReplicaRoutingMiddleware`` decides per request
+whether the opted-in view may actually use a replica:
+
+* only safe methods (GET/HEAD/OPTIONS) are routed to replicas;
+* once a request writes, its later reads go to the primary, and the client is
+  pinned to the primary for ``REPLICA_PIN_SECONDS`` so the user reads their
+  own writes despite replication lag;
+* ``REPLICA_READ_OVERRIDES`` (url name -> bool) turns replica reads on or off
+  for a single view without touching code; ``@primary_reads`` does the same in
+  code.
+
+Only models from ``REPLICA_APP_LABELS`` are routed, so sessions and other
+framework tables always stay on the primary.
+"""
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+PIN_COOKIE = 'db_pin_primary'
+
+_request_state = ContextVar('replica_request_state', default=None)
+
+
+class _RequestState:
+    __slots__ = ('use_replica', 'wrote')
+
+    def __init__(self):
+        self.use_replica = False
+        self.wrote = False
+
+
+def replica_reads(view_func):
+    view_func.replica_reads = True
+    return view_func
+
+
+def primary_reads(view_func):
+    view_func.replica_reads = False
+    return view_func
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is None or not state.use_replica or state.wrote:
+            return None
+        if model._meta.app_label not in settings.REPLICA_APP_LABELS:
+            return None
+        aliases = replica_aliases()
+        return random.choice(aliases) if aliases else None
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {'default', *replica_aliases()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        state = _RequestState()
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        return self._pin(state, response)
+
+    async def __acall__(self, request):
+        state = _RequestState()
+        token = _request_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        return self._pin(state, response)
+
+    def _pin(self, state, response):
+        if state.wrote:
+            response.set_cookie(PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = _request_state.get()
+        if state is None or not replica_aliases():
+            return None
+        allowed = getattr(view_func, 'replica_reads', False)
+        match = request.resolver_match
+        if match is not None and match.url_name in settings.REPLICA_READ_OVERRIDES:
+            allowed = settings.REPLICA_READ_OVERRIDES[match.url_name]
+        state.use_replica = (
+            allowed
+            and request.method in self.SAFE_METHODS
+            and PIN_COOKIE not in request.COOKIES
+        )
+        return None
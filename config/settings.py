@@ -4,8 +4,8 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = 'dev-secret-key-change-later'
-DEBUG = True
-ALLOWED_HOSTS = []
+DEBUG = os.environ.get('DJANGO_DEBUG', '1') == '1'
+ALLOWED_HOSTS = [h for h in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if h]
 
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -17,6 +17,8 @@ INSTALLED_APPS = [
     # local apps
     'accounts',
     'bookings',
+    'api',
+    'analytics',
 ]
 
 MIDDLEWARE = [
@@ -25,6 +27,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'config.replicas.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -51,12 +54,111 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 ASGI_APPLICATION = 'config.asgi.application'
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db_dev.sqlite3',
+# Database profile, selected with DB_ENGINE:
+#   sqlite       (default) tuned SQLite: WAL, busy timeout, synchronous=NORMAL
+#   sqlite_plain stock SQLite settings (baseline for benchmarks)
+#   postgres     PostgreSQL with persistent, health-checked connections
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'schedulify'),
+            'USER': os.environ.get('DB_USER', 'schedulify'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': True,
+            # transaction-pooling proxies (PgBouncer) cannot keep server-side cursors open
+            'DISABLE_SERVER_SIDE_CURSORS': os.environ.get('DB_POOLER') == 'pgbouncer',
+            'OPTIONS': {
+                'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', '5')),
+            },
+        }
+    }
+elif DB_ENGINE == 'sqlite_plain':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db_dev.sqlite3'),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'config.sqlite_tuned',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db_dev.sqlite3'),
+            'OPTIONS': {
+                # seconds a writer waits on the lock before "database is locked"
+                'timeout': float(os.environ.get('DB_BUSY_TIMEOUT', '20')),
+            },
+        }
+    }
+
+# Read replicas: DB_REPLICA_HOSTS (postgres) or DB_REPLICA_NAMES (sqlite files,
+# e.g. a copy of the primary for local testing), comma-separated. Each becomes
+# an alias replica1, replica2, ... that read-only views may use.
+_replica_key = 'HOST' if DB_ENGINE == 'postgres' else 'NAME'
+_replica_values = os.environ.get('DB_REPLICA_HOSTS' if DB_ENGINE == 'postgres' else 'DB_REPLICA_NAMES', '')
+DATABASE_REPLICAS = []
+for _i, _value in enumerate(v.strip() for v in _replica_values.split(',') if v.strip()):
+    _alias = f'replica{_i + 1}'
+    DATABASES[_alias] = {**DATABASES['default'], _replica_key: _value, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(_alias)
+
+DATABASE_ROUTERS = ['config.replicas.ReplicaRouter']
+REPLICA_APP_LABELS = {'accounts', 'bookings'}
+# seconds a client stays on the primary after one of its requests wrote
+REPLICA_PIN_SECONDS = int(os.environ.get('DB_REPLICA_PIN_SECONDS', '5'))
+# url name -> bool, overrides @replica_reads / @primary_reads for one view
+REPLICA_READ_OVERRIDES = {}
+
+# Shared cache (rate limit buckets, idempotency keys). Local memory is per
+# process; set CACHE_REDIS_URL when running more than one worker.
+if os.environ.get('CACHE_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['CACHE_REDIS_URL'],
+        },
+        'slot_index': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['CACHE_REDIS_URL'],
+            'KEY_PREFIX': 'slotidx',
+        },
     }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'slot_index': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'slot-index',
+            # one entry per provider-day
+            'OPTIONS': {'MAX_ENTRIES': 200000},
+        },
+    }
+
+# scope -> (burst, per_seconds): token bucket per user and per client IP
+RATE_LIMITS = {
+    'booking': (5, 60),
 }
+# only enable behind a proxy that overwrites X-Forwarded-For
+RATE_LIMIT_TRUST_FORWARDED_FOR = os.environ.get('RATE_LIMIT_TRUST_FORWARDED_FOR') == '1'
+# how long a duplicate waits on an in-flight request before it may retry
+IDEMPOTENCY_LOCK_SECONDS = 30
+# a duplicate (e.g. a double-click) waits this long for the first response
+IDEMPOTENCY_WAIT_SECONDS = 5
+
+# Free-slot bitmap index (bookings/slot_index.py), kept in the 'slot_index'
+# cache: per process by default, shared once CACHE_REDIS_URL is set.
+SLOT_INDEX_ENABLED = os.environ.get('SLOT_INDEX_ENABLED') == '1'
+SLOT_INDEX_CACHE = 'slot_index'
+# entries expire so a missed update cannot outlive this many seconds
+SLOT_INDEX_TIMEOUT = int(os.environ.get('SLOT_INDEX_TIMEOUT', '3600'))
 
 AUTH_PASSWORD_VALIDATORS = []
 
@@ -67,6 +169,23 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+# Outside DEBUG, collectstatic writes hashed names plus .gz/.br copies
+# (config/staticfiles.py); templates must use {% static %} to pick them up.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'config.staticfiles.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
+# let Django serve STATIC_ROOT (with far-future cache headers) when no web
+# server in front of it does
+SERVE_STATIC = os.environ.get('SERVE_STATIC') == '1'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_REDIRECT_URL = 'dashboard'
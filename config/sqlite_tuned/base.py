@@ -0,0 +1,30 @@
+"""SQLite backend tuned for a single-node deployment.
+
+Identical to Django's sqlite3 backend, except every new connection applies
+the PRAGMAs listed under ``OPTIONS['pragmas']``. The defaults switch to WAL
+(readers no longer block the writer), relax fsync to ``synchronous=NORMAL``
+(safe in WAL mode) and keep temp tables in memory. Lock waits are handled by
+the standard ``OPTIONS['timeout']``, which sqlite3 uses as its busy timeout.
+"""
+from django.db.backends.sqlite3 import base
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'temp_store': 'MEMORY',
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pragmas', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        pragmas = {**DEFAULT_PRAGMAS, **self.settings_dict['OPTIONS'].get('pragmas', {})}
+        for name, value in pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
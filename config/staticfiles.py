@@ -0,0 +1,116 @@
+"""Production static files: content-hashed names and pre-compressed copies.
+
+``collectstatic`` with ``CompressedManifestStaticFilesStorage`` stores every
+file under a hashed name (``css/style.3f2a9c1b0d4e.css``) exactly like
+``ManifestStaticFilesStorage`` and then writes ``.gz`` and, when the optional
+``brotli`` package is installed, ``.br`` siblings of the hashed text assets.
+Compression happens once at deploy time at the highest level, so neither
+Django nor the web server spends CPU on it per request.
+
+Because a hashed name changes whenever the content does, those files can be
+cached by browsers "forever"; ``serve_static`` (or the web server, see the
+README) sends them with a one-year ``immutable`` ``Cache-Control``.
+"""
+import gzip
+import mimetypes
+import os
+import posixpath
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.json', '.map', '.svg', '.txt', '.xml', '.html')
+# below this, compressed output plus headers is rarely smaller
+MIN_COMPRESS_SIZE = 256
+FAR_FUTURE_SECONDS = 365 * 24 * 60 * 60
+# unhashed names can change in place, so keep them short-lived
+UNHASHED_MAX_AGE = 60
+
+
+def _compressors():
+    yield '.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield '.br', lambda data: brotli.compress(data, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for hashed_name in set(self.hashed_files.values()):
+            if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self._write_compressed(hashed_name)
+
+    def _write_compressed(self, name):
+        with self.open(name) as original:
+            data = original.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+        for suffix, compress in _compressors():
+            compressed = compress(data)
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            if len(compressed) < len(data):
+                self._save(name + suffix, ContentFile(compressed))
+
+
+@lru_cache(maxsize=1)
+def _hashed_names():
+    return frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+
+def _accepts(request, encoding):
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        token, _, params = part.strip().partition(';')
+        if token.strip() == encoding:
+            return params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+@require_safe
+def serve_static(request, path):
+    """Serve a file from ``STATIC_ROOT`` for deployments without a front web server."""
+    path = posixpath.normpath(path).lstrip('/')
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('Not found')
+    if not os.path.isfile(full_path):
+        raise Http404('Not found')
+
+    served, encoding = full_path, None
+    for name, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if _accepts(request, name) and os.path.isfile(full_path + suffix):
+            served, encoding = full_path + suffix, name
+            break
+    stat = os.stat(served)
+    if not was_modified_since(request.headers.get('If-Modified-Since'), stat.st_mtime):
+        response = HttpResponseNotModified()
+    else:
+        content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+        response = FileResponse(open(served, 'rb'), content_type=content_type, filename=os.path.basename(full_path))
+        response.headers['Last-Modified'] = http_date(stat.st_mtime)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    if path in _hashed_names():
+        response.headers['Cache-Control'] = f'public, max-age={FAR_FUTURE_SECONDS}, immutable'
+    else:
+        response.headers['Cache-Control'] = f'public, max-age={UNHASHED_MAX_AGE}'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
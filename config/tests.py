@@ -0,0 +1,92 @@
+from django.contrib.auth.models import Group
+from django.db import connections
+from django.http import HttpResponse
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import path
+
+from accounts.models import User
+from .replicas import PIN_COOKIE, primary_reads, replica_reads
+
+REPLICA = 'replica1'
+
+
+@replica_reads
+def replica_view(request):
+    return HttpResponse(str(User.objects.count()))
+
+
+@primary_reads
+def primary_view(request):
+    return HttpResponse(str(User.objects.count()))
+
+
+@replica_reads
+def write_view(request):
+    Group.objects.create(name='writers')
+    return HttpResponse('ok')
+
+
+urlpatterns = [
+    path('replica/', replica_view, name='replica_view'),
+    path('primary/', primary_view, name='primary_view'),
+    path('write/', write_view, name='write_view'),
+]
+
+
+@override_settings(ROOT_URLCONF='config.tests', DATABASE_REPLICAS=[REPLICA])
+class ReplicaRoutingTests(TransactionTestCase):
+    """Routing against a ``TEST: {'MIRROR': 'default'}`` alias, as with ``DB_REPLICA_NAMES``.
+
+    A ``TransactionTestCase``: ``TestCase`` would hold a transaction open on
+    both connections, and SQLite's shared-cache locks then block the writes.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # the alias only exists when DB_REPLICA_NAMES is set, so add one that
+        # mirrors the (already created) test database
+        if REPLICA not in connections.settings:
+            connections.settings[REPLICA] = {
+                **connections['default'].settings_dict,
+                'TEST': {**connections['default'].settings_dict['TEST'], 'MIRROR': 'default'},
+            }
+            cls.addClassCleanup(cls._drop_replica)
+        cls.databases = {'default', REPLICA}
+        super().setUpClass()
+
+    @classmethod
+    def _drop_replica(cls):
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+    def get_with_queries(self, url):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(primary), len(replica)
+
+    def test_replica_reads_view_uses_replica(self):
+        self.assertEqual(self.get_with_queries('/replica/'), (0, 1))
+
+    def test_write_pins_client_to_primary(self):
+        response = self.client.post('/write/')
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertEqual(self.get_with_queries('/replica/'), (1, 0))
+
+    def test_read_only_get_does_not_pin(self):
+        response = self.client.get('/replica/')
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_primary_reads_view_uses_primary(self):
+        self.assertEqual(self.get_with_queries('/primary/'), (1, 0))
+
+    def test_override_turns_replica_reads_off(self):
+        with self.settings(REPLICA_READ_OVERRIDES={'replica_view': False}):
+            self.assertEqual(self.get_with_queries('/replica/'), (1, 0))
+
+    def test_override_turns_replica_reads_on(self):
+        with self.settings(REPLICA_READ_OVERRIDES={'primary_view': True}):
+            self.assertEqual(self.get_with_queries('/primary/'), (0, 1))
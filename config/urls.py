@@ -1,9 +1,11 @@
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.http import HttpResponse
 from django.shortcuts import render
 from django.shortcuts import redirect
 from django.urls import reverse
+from .staticfiles import serve_static
 
 
 def home(request):
@@ -13,6 +15,8 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('accounts/', include('accounts.urls')),
     path('bookings/', include('bookings.urls')),
+    path('api/', include('api.urls')),
+    path('analytics/', include('analytics.urls')),
     # Root convenience aliases
     path('register/', lambda r: redirect('auth_combined'), name='register_alias'),
     path('login/', lambda r: redirect('auth_combined'), name='login_alias'),
@@ -22,3 +26,6 @@ urlpatterns = [
     path('book/<int:provider>/', lambda r, provider: redirect(f"{reverse('booking_wizard')}?provider={provider}"), name='book_provider_alias'),
     path('', home, name='home'),
 ]
+
+if settings.SERVE_STATIC and not settings.DEBUG:
+    urlpatterns.insert(0, re_path(r'^%s(?P<path>.*)$' % settings.STATIC_URL.lstrip('/'), serve_static))
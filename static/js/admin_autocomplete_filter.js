@@ -0,0 +1,18 @@
+/**
+ * Admin changelist filters backed by the autocomplete view:
+ * picking (or clearing) a value reloads the list with the filter applied.
+ */
+'use strict';
+{
+  const $ = django.jQuery;
+
+  $(document).on('change', '.admin-autocomplete-filter', function() {
+    const url = new URL(window.location.href);
+    url.searchParams.delete(this.dataset.parameter);
+    url.searchParams.delete('p');
+    if (this.value) {
+      url.searchParams.set(this.dataset.parameter, this.value);
+    }
+    window.location.href = url.toString();
+  });
+}
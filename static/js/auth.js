@@ -0,0 +1,98 @@
+document.addEventListener('DOMContentLoaded', function() {
+  const roleSelect = document.querySelector('select[name="reg-role"]');
+  const specialtyGroup = document.getElementById('specialtyGroup');
+  const specialtyInput = document.querySelector('input[name="reg-specialty"]');
+  const roleHelp = document.getElementById('roleHelp');
+  const customerInfo = document.getElementById('customerInfo');
+  const providerInfo = document.getElementById('providerInfo');
+
+  function updateRoleInterface() {
+    if (!roleSelect) return;
+
+    const selectedRole = roleSelect.value;
+
+    // Hide all info cards first
+    if (customerInfo) customerInfo.classList.add('d-none');
+    if (providerInfo) providerInfo.classList.add('d-none');
+
+    if (selectedRole === 'provider') {
+      // Show specialty field
+      if (specialtyGroup) specialtyGroup.style.display = '';
+      if (specialtyInput) {
+        specialtyInput.placeholder = 'e.g., Cardiology, Dermatology, General Practice';
+        specialtyInput.required = true;
+      }
+      if (roleHelp) roleHelp.textContent = 'Healthcare providers can manage appointments and set availability';
+      if (providerInfo) providerInfo.classList.remove('d-none');
+
+    } else if (selectedRole === 'customer') {
+      // Hide specialty field
+      if (specialtyGroup) specialtyGroup.style.display = 'none';
+      if (specialtyInput) {
+        specialtyInput.value = '';
+        specialtyInput.required = false;
+      }
+      if (roleHelp) roleHelp.textContent = 'Patients can browse providers and book appointments';
+      if (customerInfo) customerInfo.classList.remove('d-none');
+
+    } else {
+      // No role selected
+      if (specialtyGroup) specialtyGroup.style.display = 'none';
+      if (roleHelp) roleHelp.textContent = 'Choose your account type';
+    }
+  }
+
+  // Initialize role interface
+  if (roleSelect) {
+    updateRoleInterface();
+    roleSelect.addEventListener('change', updateRoleInterface);
+  }
+
+  // Enhanced form styling
+  const formControls = document.querySelectorAll('.form-control');
+  formControls.forEach(input => {
+    input.classList.add('form-control-lg');
+
+    // Add focus effects
+    input.addEventListener('focus', function() {
+      this.parentElement.classList.add('focused');
+    });
+
+    input.addEventListener('blur', function() {
+      this.parentElement.classList.remove('focused');
+    });
+  });
+
+  // Password strength indicator (basic)
+  const password1 = document.querySelector('input[name="reg-password1"]');
+  const password2 = document.querySelector('input[name="reg-password2"]');
+
+  if (password1) {
+    password1.addEventListener('input', function() {
+      const strength = getPasswordStrength(this.value);
+      // Add visual feedback for password strength
+      this.classList.remove('is-weak', 'is-medium', 'is-strong');
+      if (this.value.length > 0) {
+        this.classList.add(`is-${strength}`);
+      }
+    });
+  }
+
+  if (password2 && password1) {
+    password2.addEventListener('input', function() {
+      if (this.value && this.value !== password1.value) {
+        this.classList.add('is-invalid');
+        this.classList.remove('is-valid');
+      } else if (this.value === password1.value && this.value.length > 0) {
+        this.classList.remove('is-invalid');
+        this.classList.add('is-valid');
+      }
+    });
+  }
+});
+
+function getPasswordStrength(password) {
+  if (password.length < 6) return 'weak';
+  if (password.length < 10) return 'medium';
+  return 'strong';
+}
@@ -0,0 +1,426 @@
+document.addEventListener('DOMContentLoaded', function() {
+  const providerSelect = document.getElementById('providerSelect');
+  const dateInput = document.getElementById('dateInput');
+  const slotsContainer = document.getElementById('slotsContainer');
+  const loadingOverlay = document.getElementById('loadingOverlay');
+  const patientNotes = document.getElementById('patient_notes');
+  const charCount = document.getElementById('charCount');
+  const confirmForm = document.getElementById('confirmationForm');
+
+  // Character counter for patient notes
+  if (patientNotes && charCount) {
+    patientNotes.addEventListener('input', function() {
+      const count = this.value.length;
+      charCount.textContent = count;
+
+      if (count > 450) {
+        charCount.style.color = '#dc2626';
+      } else if (count > 400) {
+        charCount.style.color = '#f59e0b';
+      } else {
+        charCount.style.color = '#6b7280';
+      }
+    });
+  }
+
+  // Form validation for confirmation
+  if (confirmForm) {
+    confirmForm.addEventListener('submit', function(e) {
+      let isValid = true;
+      let errorMessage = '';
+
+      // Validate appointment type
+      const appointmentType = document.querySelector('input[name="appointment_type"]:checked');
+      if (!appointmentType) {
+        isValid = false;
+        errorMessage = 'Please select an appointment type';
+        highlightError('appointment_type');
+      }
+
+      // Validate patient notes length
+      if (patientNotes && patientNotes.value.length > 500) {
+        isValid = false;
+        errorMessage = 'Patient notes must be 500 characters or less';
+        highlightError('patient_notes');
+      }
+
+      // Check for required provider and slot
+      const slotInput = document.querySelector('input[name="slot"]');
+      if (!slotInput || !slotInput.value) {
+        isValid = false;
+        errorMessage = 'Invalid appointment slot';
+      }
+
+      if (!isValid) {
+        e.preventDefault();
+        showNotification(errorMessage, 'danger');
+        return;
+      }
+
+      // Show loading state
+      const submitBtn = document.getElementById('confirmBtn');
+      if (submitBtn) {
+        submitBtn.innerHTML = '<i class="spinner-border spinner-border-sm me-2"></i>Confirming...';
+        submitBtn.disabled = true;
+      }
+    });
+
+    // Real-time validation feedback
+    document.querySelectorAll('input[name="appointment_type"]').forEach(input => {
+      input.addEventListener('change', function() {
+        clearError('appointment_type');
+      });
+    });
+
+    if (patientNotes) {
+      patientNotes.addEventListener('input', function() {
+        clearError('patient_notes');
+      });
+    }
+  }
+
+  // Validation helper functions
+  function highlightError(fieldName) {
+    if (fieldName === 'appointment_type') {
+      document.querySelectorAll('.appointment-type-card').forEach(card => {
+        card.classList.add('border-danger');
+        card.classList.remove('border');
+      });
+    } else {
+      const field = document.querySelector(`[name="${fieldName}"]`);
+      if (field) {
+        field.classList.add('is-invalid');
+      }
+    }
+  }
+
+  function clearError(fieldName) {
+    if (fieldName === 'appointment_type') {
+      document.querySelectorAll('.appointment-type-card').forEach(card => {
+        card.classList.remove('border-danger');
+        card.classList.add('border');
+      });
+    } else {
+      const field = document.querySelector(`[name="${fieldName}"]`);
+      if (field) {
+        field.classList.remove('is-invalid');
+      }
+    }
+  }
+
+  // Validate wizard steps
+  function validateStep(stepNumber) {
+    switch(stepNumber) {
+      case 1:
+        if (!providerSelect || !providerSelect.value) {
+          showNotification('Please select a healthcare provider', 'warning');
+          return false;
+        }
+        break;
+      case 2:
+        if (!dateInput || !dateInput.value) {
+          showNotification('Please select an appointment date', 'warning');
+          return false;
+        }
+
+        const selectedDate = new Date(dateInput.value);
+        const today = new Date();
+        today.setHours(0, 0, 0, 0);
+
+        if (selectedDate < today) {
+          showNotification('Please select a date that is today or in the future', 'danger');
+          dateInput.classList.add('is-invalid');
+          return false;
+        }
+
+        const maxDate = new Date();
+        maxDate.setDate(maxDate.getDate() + 30);
+        maxDate.setHours(23, 59, 59, 999);
+
+        if (selectedDate > maxDate) {
+          showNotification('Please select a date within the next 30 days', 'danger');
+          dateInput.classList.add('is-invalid');
+          return false;
+        }
+
+        dateInput.classList.remove('is-invalid');
+        break;
+    }
+    return true;
+  }
+
+  // Auto-submit form when provider or date changes
+  function updateForm() {
+    const form = document.getElementById('wizardForm');
+    if (form) {
+      showLoading();
+      form.submit();
+    }
+  }
+
+  function showLoading() {
+    if (loadingOverlay) {
+      loadingOverlay.style.display = 'flex';
+    }
+  }
+
+  function hideLoading() {
+    if (loadingOverlay) {
+      loadingOverlay.style.display = 'none';
+    }
+  }
+
+  // Enhanced AJAX slot loading
+  function fetchSlots() {
+    const provider = providerSelect ? providerSelect.value : '';
+    if (!provider) { 
+      if (slotsContainer) slotsContainer.innerHTML = ''; 
+      return; 
+    }
+
+    const date = dateInput ? dateInput.value : '';
+    if (!date) return;
+
+    let url = `/bookings/api/providers/${provider}/slots/`;
+    if (date) { 
+      url += `?date=${date}`; 
+    }
+
+    showLoading();
+
+    fetch(url)
+      .then(response => response.json())
+      .then(data => {
+        hideLoading();
+
+        if (!Array.isArray(data.slots) || data.slots.length === 0) {
+          slotsContainer.innerHTML = `
+            <div class="card mb-4">
+              <div class="card-body">
+                <div class="empty-state">
+                  <div class="empty-state-icon">
+                    <i class="bi bi-calendar-x"></i>
+                  </div>
+                  <h5>No available slots for this date</h5>
+                  <p class="text-muted">
+                    ${data.provider?.name || 'The provider'} doesn't have any available time slots for ${new Date(date).toLocaleDateString()}.
+                  </p>
+                  <div class="mt-3">
+                    <button class="btn btn-outline-primary" onclick="suggestAlternativeDates()">
+                      <i class="bi bi-calendar-week me-2"></i>View Alternative Dates
+                    </button>
+                    <button class="btn btn-outline-secondary ms-2" onclick="joinWaitingList()">
+                      <i class="bi bi-bell me-2"></i>Join Waiting List
+                    </button>
+                  </div>
+                </div>
+              </div>
+            </div>
+          `;
+          return;
+        }
+
+        let html = `
+          <div class="card mb-4">
+            <div class="card-header d-flex justify-content-between align-items-center">
+              <h4 class="mb-0">
+                <i class="bi bi-clock me-2"></i>Available Time Slots
+              </h4>
+              <span class="badge badge-primary">${new Date(date).toLocaleDateString('en-US', {month: 'short', day: 'numeric', year: 'numeric'})}</span>
+            </div>
+            <div class="card-body">
+              <div class="time-slots">
+        `;
+
+        data.slots.forEach(slot => {
+          const params = new URLSearchParams({
+            provider: provider,
+            date: date,
+            slot: slot.id
+          });
+
+          html += `
+            <a href="?${params.toString()}" class="time-slot" data-slot-id="${slot.id}">
+              <div class="time-slot-time">${slot.formatted_time}</div>
+              <div class="time-slot-duration">${slot.duration}min</div>
+            </a>
+          `;
+        });
+
+        html += `
+              </div>
+              <div class="mt-4 p-3 bg-light rounded">
+                <h6 class="mb-2">
+                  <i class="bi bi-info-circle text-primary me-2"></i>Booking Information
+                </h6>
+                <div class="row">
+                  <div class="col-md-6">
+                    <small class="text-muted">
+                      <strong>Provider:</strong> ${data.provider?.name || 'Provider'}<br>
+                      <strong>Specialty:</strong> ${data.provider?.specialty || 'General Practice'}<br>
+                      <strong>Date:</strong> ${new Date(date).toLocaleDateString('en-US', { weekday: 'long', year: 'numeric', month: 'long', day: 'numeric' })}
+                    </small>
+                  </div>
+                  <div class="col-md-6">
+                    <small class="text-muted">
+                      <strong>Available Slots:</strong> ${data.count}<br>
+                      <strong>Location:</strong> Medical Center<br>
+                      <strong>Duration:</strong> 30 minutes each
+                    </small>
+                  </div>
+                </div>
+                <div class="mt-3">
+                  <button class="btn btn-sm btn-outline-primary" onclick="refreshSlots()">
+                    <i class="bi bi-arrow-clockwise me-1"></i>Refresh Availability
+                  </button>
+                  <button class="btn btn-sm btn-outline-secondary" onclick="suggestAlternativeDates()">
+                    <i class="bi bi-calendar-week me-1"></i>Show More Dates
+                  </button>
+                </div>
+              </div>
+            </div>
+          </div>
+        `;
+
+        slotsContainer.innerHTML = html;
+      })
+      .catch(error => {
+        hideLoading();
+        console.error('Error loading slots:', error);
+        showNotification('Error loading time slots. Please try again.', 'danger');
+        slotsContainer.innerHTML = `
+          <div class="alert alert-danger">
+            <i class="bi bi-exclamation-triangle me-2"></i>
+            Error loading time slots. Please try again.
+          </div>
+        `;
+      });
+  }
+
+  // Event listeners
+  if (providerSelect) {
+    providerSelect.addEventListener('change', function() {
+      if (this.value) {
+        // Auto-submit to load date picker
+        setTimeout(updateForm, 100);
+      }
+    });
+  }
+
+  if (dateInput) {
+    dateInput.addEventListener('change', function() {
+      if (this.value && providerSelect && providerSelect.value) {
+        fetchSlots();
+      }
+    });
+  }
+
+  // Set minimum date to today
+  if (dateInput) {
+    const today = new Date().toISOString().split('T')[0];
+    dateInput.min = today;
+
+    // Set maximum date to 30 days from now
+    const maxDate = new Date();
+    maxDate.setDate(maxDate.getDate() + 30);
+    dateInput.max = maxDate.toISOString().split('T')[0];
+  }
+
+  // Enhanced appointment type selection
+  document.querySelectorAll('input[name="appointment_type"]').forEach(radio => {
+    radio.addEventListener('change', function() {
+      // Remove active state from all cards
+      document.querySelectorAll('.appointment-type-card').forEach(card => {
+        card.classList.remove('border-primary', 'bg-primary', 'text-white');
+        card.classList.add('border');
+      });
+
+      // Add active state to selected card
+      const selectedCard = this.closest('.form-check').querySelector('.appointment-type-card');
+      if (selectedCard) {
+        selectedCard.classList.remove('border');
+        selectedCard.classList.add('border-primary', 'bg-primary', 'text-white');
+      }
+    });
+  });
+
+  // Hide loading on page load
+  setTimeout(hideLoading, 500);
+});
+
+// Global helper functions
+function refreshSlots() {
+  const providerSelect = document.getElementById('providerSelect');
+  const dateInput = document.getElementById('dateInput');
+
+  if (providerSelect && dateInput && providerSelect.value && dateInput.value) {
+    showNotification('Refreshing availability...', 'info');
+
+    // Re-fetch slots
+    setTimeout(() => {
+      const event = new Event('change');
+      dateInput.dispatchEvent(event);
+    }, 500);
+  }
+}
+
+function selectSlot(slotId) {
+  const providerSelect = document.getElementById('providerSelect');
+  const dateInput = document.getElementById('dateInput');
+
+  const provider = providerSelect ? providerSelect.value : '';
+  const date = dateInput ? dateInput.value : '';
+
+  const params = new URLSearchParams({
+    provider: provider,
+    date: date,
+    slot: slotId
+  });
+
+  window.location.href = `?${params.toString()}`;
+}
+
+function suggestAlternativeDates() {
+  const providerSelect = document.getElementById('providerSelect');
+  if (!providerSelect || !providerSelect.value) {
+    showNotification('Please select a provider first', 'warning');
+    return;
+  }
+
+  // This would show a modal with alternative dates
+  showNotification('Alternative date suggestions feature coming soon!', 'info');
+}
+
+function joinWaitingList() {
+  const providerSelect = document.getElementById('providerSelect');
+  const dateInput = document.getElementById('dateInput');
+
+  if (!providerSelect || !providerSelect.value || !dateInput || !dateInput.value) {
+    showNotification('Please select a provider and date first', 'warning');
+    return;
+  }
+
+  // This would add user to waiting list
+  showNotification('Waiting list feature coming soon! You will be notified when slots become available.', 'info');
+}
+
+function showNotification(message, type = 'info') {
+  // Create notification toast
+  const toast = document.createElement('div');
+  toast.className = `alert alert-${type} alert-dismissible fade show position-fixed`;
+  toast.style.cssText = 'top: 20px; right: 20px; z-index: 9999; min-width: 300px;';
+
+  toast.innerHTML = `
+    ${message}
+    <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+  `;
+
+  document.body.appendChild(toast);
+
+  // Auto-dismiss after 5 seconds
+  setTimeout(() => {
+    if (toast.parentNode) {
+      toast.remove();
+    }
+  }, 5000);
+}
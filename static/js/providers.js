@@ -0,0 +1,24 @@
+function showProviderDetails(providerId) {
+  // This would show a modal with provider details
+  // For now, we'll just alert
+  alert('Provider details would be shown here for provider ID: ' + providerId);
+}
+
+function loadMoreProviders() {
+  // Future implementation for pagination
+  document.getElementById('loadMoreBtn').innerHTML = '<span class="spinner me-2"></span>Loading...';
+}
+
+// Enhanced search functionality
+document.addEventListener('DOMContentLoaded', function() {
+  const searchInput = document.querySelector('.search-input');
+  if (searchInput) {
+    let timeout;
+    searchInput.addEventListener('input', function() {
+      clearTimeout(timeout);
+      timeout = setTimeout(() => {
+        // Real-time search would be implemented here
+      }, 300);
+    });
+  }
+});